@@ -7,13 +7,16 @@ It also initializes the Flask-JWT-Extended extension for
 user authentication and provides the JWTManager.
 
 The application uses SQLAlchemy for database operations.
-And Amazon Web Services: SQS, Lambda and S3 Buckets to maintain images.
+And Amazon Web Services: SQS, Lambda and S3 Buckets to maintain images,
+or the local filesystem with IMAGE_BACKEND=local.
 
 Usage:
     export AWS_ACCESS_KEY_ID=<value>
     export AWS_SECRET_ACCESS_KEY=<value>
     export SECRET_KEY=<value>
     export JWT_SECRET_KEY=<value>
+    export DISTRIBUTOR_TOKEN=<value>
+    export IMAGE_BACKEND=<aws|local> (optional)
     flask run
 
 Author:
@@ -31,23 +34,32 @@ from src.controller.space_controller import space_controller
 from src.controller.assignment_controller import assignment_controller
 from src.controller.share_controller import share_controller
 from src.controller.image_controller import image_controller
+from src.controller.local_image_controller import local_image_controller
+from src.controller.metrics_controller import metrics_controller
 from src.repository.sql_alchemy_repository import Repository
 from src.service.image.image_service import ImageService
-from src.model.tockenblocklist import TokenBlocklist
+from src.service.helper.token_blocklist_cache import TokenBlocklistCache
+from src.service.helper.space_deletion_worker import SpaceDeletionWorker
 from appmodules import AppModules
 
 
-def create_app(testing=None):
+def create_app(testing=None, config=None):
     app = Flask(__name__)
     app.config.from_pyfile('app.config')
 
     if testing:
         app.config["DATABASE_URL"] = 'sqlite:///test_db.sqlite'
         app.config["MODE"] = 'test'
+        app.config["UPLOAD_SPOOL_DIR"] = 'test-upload-spool'
+        app.config["LOCAL_IMAGE_ROOT"] = 'test-images'
 
     app.config["SECRET_KEY"] = os.environ.get('SECRET_KEY')
     app.config["JWT_SECRET_KEY"] = os.environ.get('JWT_SECRET_KEY')
+    app.config["DISTRIBUTOR_TOKEN"] = os.environ.get('DISTRIBUTOR_TOKEN')
+    app.config["IMAGE_BACKEND"] = os.environ.get(
+        'IMAGE_BACKEND', app.config['IMAGE_BACKEND'])
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=999)
+    app.config.update(config or {})
 
     CORS(app, resources={r'*': {'origins': app.config['CORS_DOMAIN']}})
 
@@ -56,6 +68,9 @@ def create_app(testing=None):
     app.register_blueprint(assignment_controller)
     app.register_blueprint(share_controller)
     app.register_blueprint(image_controller)
+    app.register_blueprint(metrics_controller)
+    if app.config['IMAGE_BACKEND'] == 'local':
+        app.register_blueprint(local_image_controller)
 
     app_modules = [AppModules(app)]
 
@@ -65,6 +80,37 @@ def create_app(testing=None):
 
     repository.create_schema()
     injector.get(ImageService).create_temp_directory()
+    injector.get(SpaceDeletionWorker).resume()
+    token_blocklist_cache = injector.get(TokenBlocklistCache)
+    token_blocklist_cache.backfill_expiry()
+    token_blocklist_cache.sync()
+
+    @app.teardown_appcontext
+    def remove_session(exception=None):
+        """
+        Release the request's database session back to the connection pool.
+        """
+        repository.remove_session()
+
+    @app.cli.command('purge-token-blocklist')
+    def purge_token_blocklist():
+        """
+        Delete blocklist entries of tokens that have already expired.
+        """
+        count = token_blocklist_cache.purge_expired()
+        print(f"Purged {count} expired tokens, "
+              f"{token_blocklist_cache.get_size()} left in the blocklist")
+
+    if app.config['IMAGE_BACKEND'] == 'aws':
+        @app.cli.command('migrate-image-layout')
+        def migrate_image_layout():
+            """
+            Move the images from the bucket-per-space layout into S3_BUCKET
+            with a key prefix per space.
+            """
+            count = injector.get(ImageService).migrate_space_buckets(
+                lambda moved: print(f"Moved {moved} images", end='\r'))
+            print(f"Moved {count} images to the {app.config['S3_BUCKET']} bucket")
 
     jwt = JWTManager(app)
 
@@ -72,12 +118,10 @@ def create_app(testing=None):
     def check_if_token_revoked(jwt_header, jwt_payload: dict) -> bool:
         """
         From https://flask-jwt-extended.readthedocs.io/en/stable/
-        Callback function to check if a JWT exists in the database blocklist
+        Callback function to check if a JWT exists in the blocklist.
+        Answered from the in-memory TokenBlocklistCache.
         """
-        jti = jwt_payload["jti"]
-        token = repository.get_first_by_filter(
-            TokenBlocklist, TokenBlocklist.jti == jti)
-        return token is not None
+        return token_blocklist_cache.is_revoked(jwt_payload["jti"])
 
     @jwt.revoked_token_loader
     def revoked_token_loader(jwt_header, jwt_payload):
@@ -7,7 +7,12 @@ from src.repository.sql_alchemy_repository import Repository
 from src.repository.sql_alchemy_repository import SqlAlchemyRepository
 from src.service.image.image_service import ImageService
 from src.service.image.aws_image_service import AwsImageService
+from src.service.image.local_image_service import LocalImageService
+from src.service.image.sqs_image_distributor import SqsImageDistributor
+from src.service.image.local_image_distributor import LocalImageDistributor
 from src.service.helper.service_validator import ServiceValidator
+from src.service.helper.token_blocklist_cache import TokenBlocklistCache
+from src.service.helper.space_deletion_worker import SpaceDeletionWorker
 
 
 class AppModules(Module):
@@ -18,9 +23,29 @@ class AppModules(Module):
 
     def __init__(self, app):
         self.sql_alchemy_repository = SqlAlchemyRepository(
-            app.config['DATABASE_URL'])
+            app.config['DATABASE_URL'],
+            {
+                'pool_size': app.config['DATABASE_POOL_SIZE'],
+                'max_overflow': app.config['DATABASE_MAX_OVERFLOW'],
+                'pool_pre_ping': app.config['DATABASE_POOL_PRE_PING'],
+                'pool_recycle': app.config['DATABASE_POOL_RECYCLE']
+            }
+        )
         self.validator = ServiceValidator(self.sql_alchemy_repository)
-        self.aws_image_service = AwsImageService(app, self.validator)
+        self.image_service = self.__create_image_service(app)
+        self.token_blocklist_cache = TokenBlocklistCache(
+            self.sql_alchemy_repository,
+            app.config['JWT_BLOCKLIST_SYNC_INTERVAL'],
+            app.config['JWT_ACCESS_TOKEN_EXPIRES']
+        )
+        self.space_deletion_worker = SpaceDeletionWorker(
+            self.sql_alchemy_repository,
+            self.image_service,
+            app.config['SPACE_DELETION_BATCH_SIZE'],
+            app.config['SPACE_DELETION_WORKERS'],
+            app.config['SPACE_DELETION_MAX_ATTEMPTS'],
+            app.config['SPACE_DELETION_LEASE_TIMEOUT']
+        )
 
     def configure(self, binder):
         binder.bind(
@@ -29,5 +54,22 @@ class AppModules(Module):
         )
         binder.bind(
             ImageService,
-            to=self.aws_image_service
+            to=self.image_service
+        )
+        binder.bind(
+            TokenBlocklistCache,
+            to=self.token_blocklist_cache
+        )
+        binder.bind(
+            SpaceDeletionWorker,
+            to=self.space_deletion_worker
         )
+
+    def __create_image_service(self, app):
+        if app.config['IMAGE_BACKEND'] == 'local':
+            return LocalImageService(
+                app, self.sql_alchemy_repository, self.validator,
+                LocalImageDistributor(app, self.sql_alchemy_repository))
+        return AwsImageService(
+            app, self.sql_alchemy_repository, self.validator,
+            SqsImageDistributor(app))
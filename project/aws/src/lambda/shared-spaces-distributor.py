@@ -1,43 +1,115 @@
 # This lambda function copies an incoming object from a temp bucket to a destination bucket.
-# Every space has its own destination bucket.
+# With STORAGE_LAYOUT=bucket every space has its own destination bucket, with
+# STORAGE_LAYOUT=prefix all spaces share S3_BUCKET under spaces/<space_id>/ keys.
 # The incoming object must be named following the convention: <space_id>-<share_id>
+# When IMAGE_READY_URL is set, the application is notified once the object is copied.
+# Size variants (<space_id>-<share_id>_<variant>) are sent before their original,
+# so only the original triggers the notification.
+# A batch is processed concurrently. Buckets are looked up once per batch and messages
+# are deleted only after their object is copied. All messages share a message group,
+# so the first failed record and every record after it are returned as
+# batchItemFailures, keeping their order when they are retried. Records copied by an
+# earlier delivery find their temp object gone and count as distributed.
+import os
 import boto3
 import random
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-s3_client = boto3.client("s3")
+MAX_WORKERS = int(os.environ.get("MAX_WORKERS", "16"))
+
+s3_client = boto3.client("s3", config=Config(max_pool_connections=MAX_WORKERS))
 sqs_client = boto3.client("sqs")
 
 S3_TEMP_BUCKET = "shared-spaces-temp"
 SQS_URL = "https://sqs.us-east-1.amazonaws.com/869305664526/shared-spaces.fifo"
+# e.g. http://<host>/shares/{share_id}/image-ready
+IMAGE_READY_URL = os.environ.get("IMAGE_READY_URL")
+DISTRIBUTOR_TOKEN = os.environ.get("DISTRIBUTOR_TOKEN", "")
+STORAGE_LAYOUT = os.environ.get("STORAGE_LAYOUT", "bucket")
+S3_BUCKET = os.environ.get("S3_BUCKET", "shared-spaces")
 
 
 def lambda_handler(event, context):
+    records = event["Records"]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        buckets = resolve_buckets(records, executor)
+        results = list(executor.map(lambda record: distribute(record, buckets), records))
+
+    # Variants come before their original, so an announced original has all its variants.
+    failed_at = results.index(False) if False in results else len(records)
+    for record in records[:failed_at]:
+        notify_image_ready(record["body"])
+
+    delete_messages_from_sqs(records[:failed_at])
+    return {"batchItemFailures": [
+        {"itemIdentifier": record["messageId"]} for record in records[failed_at:]
+    ]}
+
+
+def resolve_buckets(records, executor):
+    if STORAGE_LAYOUT == "prefix":
+        return {}
+    bucket_names = {get_bucket_name(record) for record in records}
+    existing_buckets = [bucket["Name"] for bucket in s3_client.list_buckets()["Buckets"]]
+    return dict(zip(bucket_names, executor.map(
+        lambda bucket_name: resolve_bucket(bucket_name, existing_buckets),
+        bucket_names)))
+
+
+def get_destination(record, buckets):
+    object_key = record["body"]
+    if STORAGE_LAYOUT == "prefix":
+        key_prefix = create_key_prefix(
+            get_space_id(object_key), record["attributes"]["MessageGroupId"])
+        return S3_BUCKET, key_prefix + get_share_id(object_key)
+    return buckets.get(get_bucket_name(record)), get_share_id(object_key)
+
+
+def distribute(record, buckets):
+    object_key = record["body"]
+    bucket, key = get_destination(record, buckets)
+    if not bucket:
+        return False
     try:
-        for record in event["Records"]:
-            object_key = record["body"]
-            mode = record["attributes"]["MessageGroupId"]
-            delete_message_from_sqs(record)
-
-            space_id = get_space_id(object_key)
-            bucket_name = create_bucket_name(space_id, mode)
-            actual_bucket = find_bucket(bucket_name)
-
-            if not actual_bucket:
-                actual_bucket = add_random_suffix(bucket_name)
-                create_unique_bucket(actual_bucket)
+        copy_object(bucket, object_key, key)
+    except ClientError as e:
+        # The temp object is deleted once copied, so it was distributed by an earlier delivery.
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return True
+        print("Error Message: {}".format(e))
+        return False
+    try:
+        delete_object_from_temp(object_key)
+    except ClientError as e:
+        print("Error Message: {}".format(e))
+        return False
+    return True
 
-            copy_object(actual_bucket, object_key)
-            delete_object_from_temp(object_key)
 
+def resolve_bucket(bucket_name, existing_buckets):
+    try:
+        return find_bucket(bucket_name, existing_buckets) or \
+            create_unique_bucket(bucket_name)
     except ClientError as e:
         print("Error Message: {}".format(e))
+        return None
+
+
+def get_bucket_name(record):
+    return create_bucket_name(
+        get_space_id(record["body"]), record["attributes"]["MessageGroupId"])
 
 
 def create_unique_bucket(bucket_name):
     while True:
-        if create_bucket(bucket_name):
-            break
+        actual_bucket = add_random_suffix(bucket_name)
+        if create_bucket(actual_bucket):
+            return actual_bucket
 
 
 def create_bucket(bucket_name):
@@ -47,17 +119,18 @@ def create_bucket(bucket_name):
     except ClientError as e:
         if e.response["Error"]["Code"] == "BucketAlreadyExists":
             return False
+        raise
 
 
 def get_random():
     return random.randint(10000, 99999)
 
 
-def copy_object(destination_bucket, object_key):
+def copy_object(destination_bucket, object_key, destination_key):
     s3_client.copy_object(
         CopySource={"Bucket": S3_TEMP_BUCKET, "Key": object_key},
         Bucket=destination_bucket,
-        Key=get_share_id(object_key),
+        Key=destination_key,
     )
 
 
@@ -65,12 +138,10 @@ def delete_object_from_temp(object_key):
     s3_client.delete_object(Bucket=S3_TEMP_BUCKET, Key=object_key)
 
 
-def find_bucket(bucket_name):
-    response = s3_client.list_buckets()
-
-    for bucket in response["Buckets"]:
-        if bucket["Name"].startswith(bucket_name):
-            return bucket["Name"]
+def find_bucket(bucket_name, existing_buckets):
+    for name in existing_buckets:
+        if name.startswith(bucket_name + "-"):
+            return name
     return None
 
 
@@ -81,6 +152,13 @@ def create_bucket_name(space_id, mode):
     return prefix + str(space_id)
 
 
+def create_key_prefix(space_id, mode):
+    prefix = 'spaces/'
+    if mode == 'test':
+        prefix = 'test-spaces/'
+    return prefix + str(space_id) + '/'
+
+
 def add_random_suffix(bucket_name):
     return bucket_name + "-" + str(get_random())
 
@@ -93,6 +171,29 @@ def get_share_id(object_key):
     return object_key.split("-")[1]
 
 
-def delete_message_from_sqs(record):
-    sqs_client.delete_message(
-        QueueUrl=SQS_URL, ReceiptHandle=record["receiptHandle"])
+def notify_image_ready(object_key):
+    if not IMAGE_READY_URL:
+        return
+    share_id = get_share_id(object_key).split(".")[0]
+    if "_" in share_id:
+        return
+    request = urllib.request.Request(
+        IMAGE_READY_URL.format(share_id=share_id),
+        method="POST",
+        headers={"X-Distributor-Token": DISTRIBUTOR_TOKEN},
+    )
+    try:
+        urllib.request.urlopen(request, timeout=3)
+    except URLError as e:
+        print("Error Message: {}".format(e))
+
+
+def delete_messages_from_sqs(records):
+    for start in range(0, len(records), 10):
+        try:
+            sqs_client.delete_message_batch(QueueUrl=SQS_URL, Entries=[
+                {"Id": str(index), "ReceiptHandle": record["receiptHandle"]}
+                for index, record in enumerate(records[start:start + 10])
+            ])
+        except ClientError as e:
+            print("Error Message: {}".format(e))
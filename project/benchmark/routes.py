@@ -0,0 +1,383 @@
+"""
+Module defining the benchmarked routes.
+Every route has a function preparing a number of requests from the seeded dataset.
+Fixtures a request consumes, e.g. a share to delete, are created while preparing,
+so they aren't measured. A request is a (method, URL, keyword arguments) tuple
+for FlaskClient.open.
+"""
+import json
+from io import BytesIO
+
+from . import seed
+from .seed import auth, PASSWORD
+
+
+class Context():
+    """
+    This class gives the route functions the application client, the seeded
+    dataset and a random number generator, and makes unique names.
+    """
+
+    def __init__(self, client, dataset, rng, prefix, distributor_token):
+        self.client = client
+        self.dataset = dataset
+        self.rng = rng
+        self.prefix = prefix
+        self.distributor_token = distributor_token
+        self.counter = 0
+
+    def unique(self, kind):
+        """
+        Make a login or name unused in this run.
+        Args:
+            kind (str): Letter telling apart what the name is for.
+        Returns:
+            str: The unique name.
+        """
+        self.counter += 1
+        return f'{self.prefix}{kind}{self.counter}'
+
+    def member(self):
+        """
+        Pick a space and one of its members.
+        Returns:
+            tuple: (space, user)
+        """
+        space = self.rng.choice(self.dataset.spaces)
+        return space, self.rng.choice(space['members'])
+
+    def share(self):
+        """
+        Pick a share with an image and its owner.
+        Returns:
+            tuple: (share, user)
+        """
+        share = self.rng.choice(self.dataset.shares)
+        return share, share['owner']
+
+    def non_member(self, space):
+        """
+        Pick a user who isn't a member of a space.
+        Args:
+            space (dict): The target space.
+        Returns:
+            dict: The user, None if everyone is a member.
+        """
+        users = [user for user in self.dataset.users if user not in space['members']]
+        return self.rng.choice(users) if users else None
+
+    def new_share(self):
+        """
+        Create a share without an image.
+        Returns:
+            dict: The share.
+        """
+        space, user = self.member()
+        return seed.create_share(self.client, space, user)
+
+    def upload_url(self, share):
+        """
+        Get an upload URL for the image of a share.
+        Args:
+            share (dict): The target share.
+        Returns:
+            str: The upload URL.
+        """
+        response = self.client.post(f"/shares/{share['id']}/image-upload",
+                                    headers=auth(share['owner']['token']))
+        return json.loads(response.data)['url']
+
+
+def image_form(image, text='Lorem ipsum'):
+    """
+    Build the multipart form of a request uploading an image.
+    Args:
+        image (bytes): Content of the image.
+        text (str): Optional text of the share.
+    Returns:
+        dict: Keyword arguments for FlaskClient.open.
+    """
+    data = {'file': (BytesIO(image), 'img')}
+    if text:
+        data['text'] = text
+    return {'data': data, 'content_type': 'multipart/form-data'}
+
+
+def get_spaces(ctx, count):
+    return [('GET', '/spaces?limit=20', {
+        'headers': auth(ctx.rng.choice(ctx.dataset.users)['token'])})
+        for _ in range(count)]
+
+
+def get_space(ctx, count):
+    requests = []
+    for _ in range(count):
+        space, user = ctx.member()
+        requests.append(('GET', f"/spaces/{space['id']}", {'headers': auth(user['token'])}))
+    return requests
+
+
+def get_members(ctx, count):
+    requests = []
+    for _ in range(count):
+        space, user = ctx.member()
+        requests.append(
+            ('GET', f"/spaces/{space['id']}/members", {'headers': auth(user['token'])}))
+    return requests
+
+
+def get_shares(ctx, count):
+    requests = []
+    for _ in range(count):
+        space, user = ctx.member()
+        requests.append(
+            ('GET', f"/spaces/{space['id']}/shares?limit=20", {'headers': auth(user['token'])}))
+    return requests
+
+
+def get_share(ctx, count):
+    requests = []
+    for _ in range(count):
+        share, user = ctx.share()
+        requests.append(('GET', f"/shares/{share['id']}", {'headers': auth(user['token'])}))
+    return requests
+
+
+def get_image_status(ctx, count):
+    requests = []
+    for _ in range(count):
+        share, user = ctx.share()
+        requests.append(
+            ('GET', f"/shares/{share['id']}/image-status", {'headers': auth(user['token'])}))
+    return requests
+
+
+def get_images(ctx, count):
+    requests = []
+    for _ in range(count):
+        space, user = ctx.member()
+        requests.append(
+            ('GET', f"/spaces/{space['id']}/images", {'headers': auth(user['token'])}))
+    return requests
+
+
+def get_local_image(ctx, count):
+    requests = []
+    for _ in range(count):
+        share, user = ctx.share()
+        response = ctx.client.get(f"/shares/{share['id']}", headers=auth(user['token']))
+        image_url = json.loads(response.data).get('image_url')
+        if image_url:
+            requests.append(('GET', image_url, {}))
+    return requests
+
+
+def post_login(ctx, count):
+    return [('POST', '/login', {'json': {
+        'login': ctx.rng.choice(ctx.dataset.users)['login'], 'password': PASSWORD}})
+        for _ in range(count)]
+
+
+def post_register(ctx, count):
+    return [('POST', '/register', {'json': {
+        'login': ctx.unique('r'), 'password': PASSWORD, 'confirm-password': PASSWORD}})
+        for _ in range(count)]
+
+
+def put_change_password(ctx, count):
+    return [('PUT', '/change-password', {
+        'json': {'old-password': PASSWORD, 'new-password': PASSWORD,
+                 'confirm-password': PASSWORD},
+        'headers': auth(ctx.rng.choice(ctx.dataset.users)['token'])})
+        for _ in range(count)]
+
+
+def post_space(ctx, count):
+    return [('POST', '/spaces', {
+        'json': {'name': ctx.unique('s')},
+        'headers': auth(ctx.rng.choice(ctx.dataset.users)['token'])})
+        for _ in range(count)]
+
+
+def put_space(ctx, count):
+    requests = []
+    for _ in range(count):
+        space = ctx.rng.choice(ctx.dataset.spaces)
+        requests.append(('PUT', f"/spaces/{space['id']}", {
+            'json': {'new-name': ctx.unique('n')},
+            'headers': auth(space['admin']['token'])}))
+    return requests
+
+
+def post_member(ctx, count):
+    requests = []
+    for _ in range(count):
+        space = ctx.rng.choice(ctx.dataset.spaces)
+        user = ctx.non_member(space)
+        if user:
+            space['members'].append(user)
+            requests.append(('POST', f"/spaces/{space['id']}/members", {
+                'json': {'login': user['login']},
+                'headers': auth(space['admin']['token'])}))
+    return requests
+
+
+def put_member(ctx, count):
+    spaces = [space for space in ctx.dataset.spaces if len(space['members']) > 1]
+    requests = []
+    for _ in range(count if spaces else 0):
+        space = ctx.rng.choice(spaces)
+        user = ctx.rng.choice(space['members'][1:])
+        requests.append(('PUT', f"/spaces/{space['id']}/members/{user['id']}", {
+            'json': {'is-admin': True},
+            'headers': auth(space['admin']['token'])}))
+    return requests
+
+
+def post_share(ctx, count):
+    requests = []
+    for _ in range(count):
+        space, user = ctx.member()
+        requests.append(('POST', f"/spaces/{space['id']}/shares", {
+            'data': {'text': 'Lorem ipsum'}, 'content_type': 'multipart/form-data',
+            'headers': auth(user['token'])}))
+    return requests
+
+
+def post_share_with_image(ctx, count):
+    requests = []
+    for index in range(count):
+        space, user = ctx.member()
+        requests.append(('POST', f"/spaces/{space['id']}/shares", {
+            **image_form(seed.read_image(index)), 'headers': auth(user['token'])}))
+    return requests
+
+
+def put_share(ctx, count):
+    requests = []
+    for _ in range(count):
+        share = ctx.rng.choice(ctx.dataset.shares)
+        requests.append(('PUT', f"/shares/{share['id']}", {
+            'data': {'text': 'Edit lorem ipsum'}, 'content_type': 'multipart/form-data',
+            'headers': auth(share['owner']['token'])}))
+    return requests
+
+
+def post_image_ready(ctx, count):
+    return [('POST', f"/shares/{ctx.rng.choice(ctx.dataset.shares)['id']}/image-ready", {
+        'headers': {'X-Distributor-Token': ctx.distributor_token}})
+        for _ in range(count)]
+
+
+def post_image_upload(ctx, count):
+    requests = []
+    for _ in range(count):
+        share = ctx.new_share()
+        requests.append(('POST', f"/shares/{share['id']}/image-upload", {
+            'headers': auth(share['owner']['token'])}))
+    return requests
+
+
+def post_local_image(ctx, count):
+    requests = []
+    for index in range(count):
+        share = ctx.new_share()
+        requests.append(
+            ('POST', ctx.upload_url(share), image_form(seed.read_image(index), None)))
+    return requests
+
+
+def post_image_upload_confirm(ctx, count):
+    requests = []
+    for index in range(count):
+        share = ctx.new_share()
+        ctx.client.post(ctx.upload_url(share), **image_form(seed.read_image(index), None))
+        requests.append(('POST', f"/shares/{share['id']}/image-upload/confirm", {
+            'headers': auth(share['owner']['token'])}))
+    return requests
+
+
+def delete_member(ctx, count):
+    added = set()
+    requests = []
+    for _ in range(count):
+        space = ctx.rng.choice(ctx.dataset.spaces)
+        user = ctx.non_member(space)
+        if user and (space['id'], user['id']) not in added:
+            added.add((space['id'], user['id']))
+            seed.add_member(ctx.client, space, user)
+            requests.append(('DELETE', f"/spaces/{space['id']}/members/{user['id']}", {
+                'headers': auth(space['admin']['token'])}))
+    return requests
+
+
+def delete_share(ctx, count):
+    requests = []
+    for _ in range(count):
+        share = ctx.new_share()
+        requests.append(('DELETE', f"/shares/{share['id']}", {
+            'headers': auth(share['owner']['token'])}))
+    return requests
+
+
+def delete_space(ctx, count):
+    requests = []
+    for _ in range(count):
+        space = seed.create_space(
+            ctx.client, ctx.rng.choice(ctx.dataset.users), ctx.unique('d'))
+        requests.append(('DELETE', f"/spaces/{space['id']}", {
+            'headers': auth(space['admin']['token'])}))
+    return requests
+
+
+def get_space_deletion(ctx, count):
+    jobs = []
+    for _ in range(min(count, 10)):
+        space = seed.create_space(
+            ctx.client, ctx.rng.choice(ctx.dataset.users), ctx.unique('d'))
+        response = ctx.client.delete(
+            f"/spaces/{space['id']}", headers=auth(space['admin']['token']))
+        jobs.append((json.loads(response.data)['id'], space['admin']))
+    requests = []
+    for _ in range(count if jobs else 0):
+        job_id, admin = ctx.rng.choice(jobs)
+        requests.append(('GET', f'/space-deletions/{job_id}', {'headers': auth(admin['token'])}))
+    return requests
+
+
+def delete_logout(ctx, count):
+    return [('DELETE', '/logout', {'headers': auth(
+        seed.login(ctx.client, ctx.rng.choice(ctx.dataset.users)['login']))})
+        for _ in range(count)]
+
+
+# Reads go first, so they see the seeded dataset, and logouts last.
+ROUTES = [
+    ('GET /spaces', get_spaces),
+    ('GET /spaces/<space_id>', get_space),
+    ('GET /spaces/<space_id>/members', get_members),
+    ('GET /spaces/<space_id>/shares', get_shares),
+    ('GET /shares/<share_id>', get_share),
+    ('GET /shares/<share_id>/image-status', get_image_status),
+    ('GET /spaces/<space_id>/images', get_images),
+    ('GET /local-images/<token>', get_local_image),
+    ('POST /login', post_login),
+    ('POST /register', post_register),
+    ('PUT /change-password', put_change_password),
+    ('POST /spaces', post_space),
+    ('PUT /spaces/<space_id>', put_space),
+    ('POST /spaces/<space_id>/members', post_member),
+    ('PUT /spaces/<space_id>/members/<user_id>', put_member),
+    ('POST /spaces/<space_id>/shares', post_share),
+    ('PUT /shares/<share_id>', put_share),
+    ('POST /shares/<share_id>/image-ready', post_image_ready),
+    ('POST /shares/<share_id>/image-upload', post_image_upload),
+    ('POST /local-images/upload/<token>', post_local_image),
+    ('POST /shares/<share_id>/image-upload/confirm', post_image_upload_confirm),
+    ('POST /spaces/<space_id>/shares (image)', post_share_with_image),
+    ('DELETE /spaces/<space_id>/members/<user_id>', delete_member),
+    ('DELETE /shares/<share_id>', delete_share),
+    ('DELETE /spaces/<space_id>', delete_space),
+    ('GET /space-deletions/<job_id>', get_space_deletion),
+    ('DELETE /logout', delete_logout),
+]
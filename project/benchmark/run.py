@@ -0,0 +1,210 @@
+"""
+Benchmark of the REST API
+
+This script seeds a dataset and measures the latency and throughput of every route
+of the application, running in-process with the local image backend, so no AWS
+account is needed. The results are written as JSON, named after the current commit,
+and can be compared with the results of another commit.
+
+Usage:
+    python -m benchmark.run [--users 50] [--spaces 30] [--shares 100]
+                            [--requests 100] [--concurrency 8]
+                            [--routes 'GET /shares'] [--baseline <results.json>]
+
+Run from the project directory. The dataset lives in a temporary directory,
+unless --database-url points to another database.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from benchmark import seed
+from benchmark.routes import ROUTES, Context
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'results')
+DISTRIBUTOR_TOKEN = 'benchmark'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the REST API.')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--spaces', type=int, default=30)
+    parser.add_argument('--shares', type=int, default=100,
+                        help='number of seeded shares, all with images')
+    parser.add_argument('--requests', type=int, default=100,
+                        help='number of requests per route')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--routes', default='',
+                        help='run only the routes whose names contain this text')
+    parser.add_argument('--database-url')
+    parser.add_argument('--output', help='path of the results, by default '
+                        'benchmark/results/<commit>.json')
+    parser.add_argument('--baseline', help='results to compare with')
+    return parser.parse_args()
+
+
+def create_benchmark_app(directory, database_url):
+    """
+    Create the application with the local image backend and its storage
+    in a working directory.
+    Args:
+        directory (str): The working directory.
+        database_url (str): Database to use, by default SQLite in the working directory.
+    Returns:
+        Flask: The application.
+    """
+    return create_app(config={
+        'DATABASE_URL': database_url or
+        'sqlite:///' + os.path.join(directory, 'benchmark.sqlite'),
+        'IMAGE_BACKEND': 'local',
+        'LOCAL_IMAGE_ROOT': os.path.join(directory, 'images'),
+        'UPLOAD_SPOOL_DIR': os.path.join(directory, 'upload-spool'),
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+        'JWT_SECRET_KEY': os.environ.get('JWT_SECRET_KEY', 'benchmark'),
+        'DISTRIBUTOR_TOKEN': DISTRIBUTOR_TOKEN
+    })
+
+
+def measure(app, requests, concurrency):
+    """
+    Send requests from a pool of threads, each with its own client.
+    Args:
+        app (Flask): The application.
+        requests (list): (method, URL, keyword arguments) tuples.
+        concurrency (int): Number of threads.
+    Returns:
+        dict: Latency percentiles, throughput and status codes.
+    """
+    clients = threading.local()
+
+    def send(request):
+        if not hasattr(clients, 'client'):
+            clients.client = app.test_client()
+        method, url, kwargs = request
+        start = time.perf_counter()
+        response = clients.client.open(url, method=method, **kwargs)
+        latency = time.perf_counter() - start
+        response.close()
+        return latency, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(send, requests))
+    duration = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = Counter(status for _, status in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(count for status, count in statuses.items() if status >= 400),
+        'status_codes': {str(status): count for status, count in sorted(statuses.items())},
+        'mean_ms': round(1000 * sum(latencies) / len(latencies), 3),
+        'p50_ms': round(1000 * percentile(latencies, 50), 3),
+        'p99_ms': round(1000 * percentile(latencies, 99), 3),
+        'throughput_rps': round(len(samples) / duration, 2)
+    }
+
+
+def percentile(values, percent):
+    """
+    Get a nearest-rank percentile.
+    Args:
+        values (list): Sorted values.
+        percent (int): The percentile.
+    Returns:
+        float: The value.
+    """
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline):
+    """
+    Print the change of the median and p99 latency of every route against a baseline.
+    Args:
+        results (dict): The current results.
+        baseline (dict): Results of an earlier run.
+    """
+    print(f"\nCompared with {baseline['commit']}:")
+    for name, route in results['routes'].items():
+        previous = baseline['routes'].get(name)
+        if not previous:
+            continue
+        changes = [f"{key} {100 * (route[key] / previous[key] - 1):+.1f}%"
+                   for key in ('p50_ms', 'p99_ms') if previous[key]]
+        print(f"{name:50} {', '.join(changes)}")
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    prefix = f'b{int(time.time()) % 100000}'
+    directory = tempfile.mkdtemp(prefix='shared-spaces-benchmark-')
+    try:
+        app = create_benchmark_app(directory, args.database_url)
+        client = app.test_client()
+
+        start = time.perf_counter()
+        dataset = seed.seed(
+            client, rng, prefix, args.users, args.spaces, args.shares)
+        print(f'Seeded {args.users} users, {args.spaces} spaces and '
+              f'{args.shares} shares in {time.perf_counter() - start:.1f}s')
+
+        context = Context(client, dataset, rng, prefix, DISTRIBUTOR_TOKEN)
+        results = {
+            'commit': get_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'dataset': {'users': args.users, 'spaces': args.spaces,
+                        'shares': args.shares, 'seed': args.seed},
+            'requests_per_route': args.requests,
+            'concurrency': args.concurrency,
+            'routes': {}
+        }
+        for name, prepare in ROUTES:
+            if args.routes not in name:
+                continue
+            requests = prepare(context, args.requests)
+            if not requests:
+                print(f'{name:50} skipped, no fixtures')
+                continue
+            route = measure(app, requests, args.concurrency)
+            results['routes'][name] = route
+            print(f"{name:50} p50 {route['p50_ms']:9.2f} ms  p99 {route['p99_ms']:9.2f} ms  "
+                  f"{route['throughput_rps']:8.1f} req/s  {route['errors']} errors")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIRECTORY, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f'Results written to {output}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            compare(results, json.load(baseline_file))
+
+
+if __name__ == '__main__':
+    main()
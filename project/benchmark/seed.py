@@ -0,0 +1,173 @@
+"""
+Module seeding the benchmark dataset through the REST API.
+"""
+import os
+import time
+import json
+from io import BytesIO
+
+RESOURCES = os.path.join(os.path.dirname(__file__), '..', 'test', 'resources')
+IMAGES = ['test-image-1.jpg', 'test-image-2.jpg', 'test-image-3.jpg']
+PASSWORD = 'pwd'
+
+
+class Dataset():
+    """
+    This class holds the seeded users, spaces and shares, so the benchmarked
+    requests can be built from them.
+    Users are dicts with 'id', 'login' and 'token', spaces have 'id', 'admin' and
+    'members' (user dicts), and shares have 'id', 'space' and 'owner'.
+    """
+
+    def __init__(self):
+        self.users = []
+        self.spaces = []
+        self.shares = []
+
+
+def auth(token):
+    """
+    Build the authorization header of a user.
+    Args:
+        token (str): Access token of the user.
+    Returns:
+        dict: The request headers.
+    """
+    return {"Authorization": f"Bearer {token}"}
+
+
+def read_image(index):
+    """
+    Read one of the test images, chosen in turn by an index.
+    Args:
+        index (int): Any number, e.g. of the share the image is for.
+    Returns:
+        bytes: Content of the image.
+    """
+    with open(os.path.join(RESOURCES, IMAGES[index % len(IMAGES)]), 'rb') as image_file:
+        return image_file.read()
+
+
+def login(client, user_login):
+    """
+    Log a user in.
+    Args:
+        client (FlaskClient): Client of the application.
+        user_login (str): Login of the user.
+    Returns:
+        str: A new access token.
+    """
+    response = client.post('/login', json={"login": user_login, "password": PASSWORD})
+    return json.loads(response.data)['access_token']
+
+
+def register_user(client, user_login):
+    """
+    Register a user and log them in.
+    Args:
+        client (FlaskClient): Client of the application.
+        user_login (str): Login of the new user.
+    Returns:
+        dict: The user.
+    """
+    response = client.post('/register', json={
+        "login": user_login, "password": PASSWORD, "confirm-password": PASSWORD})
+    user = json.loads(response.data)
+    return {'id': user['id'], 'login': user_login, 'token': login(client, user_login)}
+
+
+def create_space(client, admin, name):
+    """
+    Create a space.
+    Args:
+        client (FlaskClient): Client of the application.
+        admin (dict): The user creating the space, who becomes its admin.
+        name (str): Name of the space.
+    Returns:
+        dict: The space.
+    """
+    response = client.post('/spaces', json={"name": name}, headers=auth(admin['token']))
+    return {'id': json.loads(response.data)['id'], 'admin': admin, 'members': [admin]}
+
+
+def add_member(client, space, user):
+    """
+    Add a user to a space.
+    Args:
+        client (FlaskClient): Client of the application.
+        space (dict): The target space.
+        user (dict): The user to add.
+    """
+    client.post(f"/spaces/{space['id']}/members", json={"login": user['login']},
+                headers=auth(space['admin']['token']))
+
+
+def create_share(client, space, owner, image=None):
+    """
+    Create a share, optionally with an image.
+    Args:
+        client (FlaskClient): Client of the application.
+        space (dict): The target space.
+        owner (dict): The member creating the share.
+        image (bytes): Optional content of the image.
+    Returns:
+        dict: The share.
+    """
+    data = {'text': 'Lorem ipsum'}
+    if image:
+        data['file'] = (BytesIO(image), 'img')
+    response = client.post(f"/spaces/{space['id']}/shares", data=data,
+                           content_type='multipart/form-data', headers=auth(owner['token']))
+    return {'id': json.loads(response.data)['id'], 'space': space, 'owner': owner}
+
+
+def wait_for_images(client, shares, timeout=60):
+    """
+    Wait until the images of shares are ready to be served.
+    Args:
+        client (FlaskClient): Client of the application.
+        shares (list): The shares with images.
+        timeout (int): Seconds to wait at most.
+    """
+    waiting = list(shares)
+    deadline = time.monotonic() + timeout
+    while waiting and time.monotonic() < deadline:
+        waiting = [share for share in waiting if json.loads(client.get(
+            f"/shares/{share['id']}", headers=auth(share['owner']['token'])
+        ).data).get('image_status') != 'ready']
+        if waiting:
+            time.sleep(0.2)
+
+
+def seed(client, rng, prefix, users, spaces, shares):
+    """
+    Seed a dataset: users, spaces with a heavy-tailed number of members, so a few
+    spaces are crowded and most are small, and shares with images, spread
+    over the spaces in proportion to their members.
+    Args:
+        client (FlaskClient): Client of the application.
+        rng (Random): Random number generator.
+        prefix (str): Prefix making the logins and names of this run unique.
+        users (int): Number of users.
+        spaces (int): Number of spaces.
+        shares (int): Number of shares.
+    Returns:
+        Dataset: The seeded dataset.
+    """
+    dataset = Dataset()
+    dataset.users = [register_user(client, f'{prefix}u{index}') for index in range(users)]
+    for index in range(spaces):
+        space = create_space(client, rng.choice(dataset.users), f'{prefix}s{index}')
+        size = min(users, int(rng.paretovariate(1.2)))
+        for user in rng.sample(dataset.users, size):
+            if user not in space['members']:
+                add_member(client, space, user)
+                space['members'].append(user)
+        dataset.spaces.append(space)
+    weights = [len(space['members']) for space in dataset.spaces]
+    for index in range(shares):
+        space = rng.choices(dataset.spaces, weights)[0]
+        dataset.shares.append(create_share(
+            client, space, rng.choice(space['members']), read_image(index)))
+    wait_for_images(client, dataset.shares)
+    return dataset
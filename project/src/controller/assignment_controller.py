@@ -17,16 +17,23 @@ assignment_controller = Blueprint('assignment_controller', __name__)
 @assignment_controller.route('/spaces')
 def get_spaces(service: AssignmentService):
     """
-    Get a list of spaces for the logged-in user.
+    Get a list of spaces for the logged-in user, sorted by name.
+    Accepts optional 'limit' and 'offset' query parameters.
     Args:
         service (AssignmentService): Instance of AssignmentService.
     Returns:
         str: JSON representation of the list of spaces.
     """
-    assignments = service.get_users_assignments()
-    json_serializable_list = [assignment.spaces_to_dict()
-                              for assignment in assignments]
-    return json.dumps(json_serializable_list)
+    try:
+        assignments = service.get_users_assignments(
+            request.args.get('limit', type=int),
+            request.args.get('offset', type=int)
+        )
+        json_serializable_list = [assignment.spaces_to_dict()
+                                  for assignment in assignments]
+        return json.dumps(json_serializable_list)
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
 
 
 @inject
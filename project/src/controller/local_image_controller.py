@@ -0,0 +1,53 @@
+"""
+Module containing the local image controller blueprint, which serves and receives
+images of the local filesystem image backend through signed URLs.
+It is only registered when the 'local' image backend is configured.
+"""
+from flask import Blueprint, request, make_response, send_file, current_app
+from injector import inject
+
+from ..exception.service.service_exception import ServiceException
+from ..service.image.image_service import ImageService
+
+local_image_controller = Blueprint('local_image_controller', __name__)
+
+
+@inject
+@local_image_controller.route('/local-images/<token>')
+def get_local_image(token, image_service: ImageService):
+    """
+    Get an image by a signed URL.
+    Args:
+        token (str): Signed token identifying the image.
+        image_service (ImageService): Instance of LocalImageService.
+    Returns:
+        The image file.
+    """
+    try:
+        return send_file(
+            image_service.get_image_path(token),
+            mimetype='image/jpeg',
+            max_age=current_app.config['MEDIA_URL_EXPIRES_IN']
+        )
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
+
+
+@inject
+@local_image_controller.route('/local-images/upload/<token>', methods=["POST"])
+def post_local_image(token, image_service: ImageService):
+    """
+    Upload an image by a signed upload URL. Accepts a form with the 'file' field.
+    Args:
+        token (str): Signed token identifying the upload.
+        image_service (ImageService): Instance of LocalImageService.
+    Returns:
+        str: Response message.
+    """
+    if not 'file' in request.files:
+        return make_response("File must be provided", 400)
+    try:
+        image_service.save_upload(token, request.files['file'])
+        return make_response('Image uploaded', 200)
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
@@ -0,0 +1,26 @@
+"""
+Module containing the metrics controller blueprint with a REST endpoint
+exposing operational metrics of the application.
+"""
+import json
+from flask import Blueprint
+from injector import inject
+
+from ..service.helper.token_blocklist_cache import TokenBlocklistCache
+
+metrics_controller = Blueprint('metrics_controller', __name__)
+
+
+@inject
+@metrics_controller.route('/metrics')
+def get_metrics(token_blocklist_cache: TokenBlocklistCache):
+    """
+    Get operational metrics of the application.
+    Args:
+        token_blocklist_cache (TokenBlocklistCache): Instance of TokenBlocklistCache.
+    Returns:
+        str: JSON representation of the metrics.
+    """
+    return json.dumps({
+        'token_blocklist_size': token_blocklist_cache.get_size()
+    })
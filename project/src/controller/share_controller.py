@@ -3,8 +3,8 @@ Module containing the share controller blueprint with REST endpoints
 for managing shares within spaces.
 """
 import json
-import time
-from flask import Blueprint, request, make_response
+import hmac
+from flask import Blueprint, request, make_response, current_app
 from injector import inject
 
 from ..exception.service.service_exception import ServiceException
@@ -19,6 +19,8 @@ share_controller = Blueprint('share_controller', __name__)
 def post_share(space_id, image_service: ImageService, service: ShareService):
     """
     Create a new share in a space and optionally upload an image.
+    The image is uploaded and distributed in the background, the returned
+    share has 'image_status' set to 'uploading' until it's ready.
     Args:
         space_id (int): ID of the target space.
         image_service (ImageService): Instance of ImageService.
@@ -38,7 +40,6 @@ def post_share(space_id, image_service: ImageService, service: ShareService):
                 request.files['file'],
                 share_id
             )
-            __wait_for_image(service, share_id)
         share = service.get_share_by_share_id(share_id)
         return json.dumps(share.to_dict())
     except ServiceException as exc:
@@ -63,11 +64,30 @@ def get_share(share_id, service: ShareService):
         return make_response(str(exc), exc.error_code)
 
 
+@inject
+@share_controller.route('/shares/<int:share_id>/image-status')
+def get_image_status(share_id, service: ShareService):
+    """
+    Get the status of a share's image: 'none', 'uploading', 'pending',
+    'ready' or 'failed', and its stored size in bytes.
+    Args:
+        share_id (int): ID of the target share.
+        service (ShareService): Instance of ShareService.
+    Returns:
+        str: JSON with the image status and size.
+    """
+    try:
+        return json.dumps(service.get_image_status(share_id))
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
+
+
 @inject
 @share_controller.route('/spaces/<int:space_id>/shares')
 def get_shares(space_id, service: ShareService):
     """
-    Get a list of shares within a space.
+    Get a list of shares within a space, newest first. Accepts optional query
+    parameters: 'limit', and 'before'/'after' with the ID of a share as a cursor.
     Args:
         space_id (int): ID of the target space.
         service (ShareService): Instance of ShareService.
@@ -75,7 +95,12 @@ def get_shares(space_id, service: ShareService):
         str: JSON representation of the list of shares.
     """
     try:
-        shares = service.get_shares_by_space_id(space_id)
+        shares = service.get_shares_by_space_id(
+            space_id,
+            request.args.get('limit', type=int),
+            request.args.get('before', type=int),
+            request.args.get('after', type=int)
+        )
         json_serializable_list = [share.shares_to_dict() for share in shares]
         return json.dumps(json_serializable_list)
     except ServiceException as exc:
@@ -124,14 +149,66 @@ def put_share(share_id, service: ShareService, image_service: ImageService):
                 request.files['file'],
                 share_id
             )
-            __wait_for_image(service, share_id)
         return make_response('Share edited', 200)
     except ServiceException as exc:
         return make_response(str(exc), exc.error_code)
 
 
-def __wait_for_image(service, share_id):
-    timeout = 7
-    while not service.get_share_by_share_id(share_id).image_url and timeout > 0:
-        time.sleep(1)
-        timeout -= 1
+@inject
+@share_controller.route('/shares/<int:share_id>/image-upload', methods=["POST"])
+def post_image_upload(share_id, image_service: ImageService):
+    """
+    Create a presigned POST, so the client can upload the share's image
+    straight to the storage. The upload has to be confirmed with
+    POST /shares/<share_id>/image-upload/confirm.
+    Args:
+        share_id (int): ID of the target share.
+        image_service (ImageService): Instance of ImageService.
+    Returns:
+        str: JSON with the 'url' and the form 'fields' of the upload.
+    """
+    try:
+        return json.dumps(image_service.create_upload_url(share_id))
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
+
+
+@inject
+@share_controller.route('/shares/<int:share_id>/image-upload/confirm', methods=["POST"])
+def post_image_upload_confirm(share_id, image_service: ImageService):
+    """
+    Confirm that the share's image has been uploaded through a presigned POST.
+    Args:
+        share_id (int): ID of the target share.
+        image_service (ImageService): Instance of ImageService.
+    Returns:
+        str: Response message.
+    """
+    try:
+        image_service.confirm_upload(share_id)
+        return make_response('Image upload confirmed', 200)
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
+
+
+@inject
+@share_controller.route('/shares/<int:share_id>/image-ready', methods=["POST"])
+def post_image_ready(share_id, service: ShareService):
+    """
+    Mark the image of a share as ready. Called by the image distributor,
+    which authenticates with the 'X-Distributor-Token' header.
+    Args:
+        share_id (int): ID of the target share.
+        service (ShareService): Instance of ShareService.
+    Returns:
+        str: Response message.
+    """
+    token = current_app.config.get('DISTRIBUTOR_TOKEN')
+    if not token or not hmac.compare_digest(
+            request.headers.get('X-Distributor-Token', ''), token):
+        return make_response("You aren't authorized", 401)
+    try:
+        service.mark_image_ready(share_id)
+        return make_response('Image marked as ready', 200)
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
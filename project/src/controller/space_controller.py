@@ -53,16 +53,35 @@ def get_space(space_id, service: SpaceService):
 @space_controller.route('/spaces/<int:space_id>', methods=["DELETE"])
 def delete_space(space_id, service: SpaceService):
     """
-    Delete a space by its ID.
+    Delete a space by its ID. The space is removed by a background job,
+    whose progress can be polled at /space-deletions/<job_id>.
     Args:
         space_id (int): ID of the target space.
         service (SpaceService): Instance of SpaceService.
     Returns:
-        str: Response message.
+        str: JSON representation of the deletion job, with status 202.
+    """
+    try:
+        job = service.delete_space_by_space_id(space_id)
+        return make_response(json.dumps(job.to_dict()), 202)
+    except ServiceException as exc:
+        return make_response(str(exc), exc.error_code)
+
+
+@inject
+@space_controller.route('/space-deletions/<int:job_id>')
+def get_space_deletion(job_id, service: SpaceService):
+    """
+    Get the status and progress of a space deletion job.
+    Args:
+        job_id (int): ID of the target job.
+        service (SpaceService): Instance of SpaceService.
+    Returns:
+        str: JSON representation of the deletion job.
     """
     try:
-        service.delete_space_by_space_id(space_id)
-        return make_response('Space deleted', 200)
+        job = service.get_deletion_job(job_id)
+        return json.dumps(job.to_dict())
     except ServiceException as exc:
         return make_response(str(exc), exc.error_code)
 
@@ -1,7 +1,8 @@
 """
 Module containing the Share model class.
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from ..model.base import Base
 
@@ -10,15 +11,42 @@ class Share(Base):
     """
     This class defines the structure of the Share entity,
     which represents shared content within spaces.
+    'image_status' follows the share's image: 'none' without an image, 'uploading'
+    while it's being uploaded in the background, 'pending' while it's being
+    distributed, 'ready' once it's in the storage and 'failed' if the upload failed.
+    'image_variants' lists the names of the downscaled variants stored
+    next to the original image, 'image_size' is the stored image's size in bytes.
+    Shares created before 'image_status' existed are backfilled as 'pending'
+    without an 'image_size', so the first lookup of their image checks the storage
+    and records 'ready', or 'none' if they have no image.
+    On SQLite the timestamp is stored the way CURRENT_TIMESTAMP writes it,
+    so it compares correctly with timestamps bound as query parameters.
     """
     __tablename__ = 'shares'
 
+    IMAGE_NONE = 'none'
+    IMAGE_UPLOADING = 'uploading'
+    IMAGE_PENDING = 'pending'
+    IMAGE_READY = 'ready'
+    IMAGE_FAILED = 'failed'
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     space_id = Column(Integer, ForeignKey('spaces.id'), nullable=False)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     text = Column(String, nullable=False)
-    timestamp = Column(DateTime, default=func.now())
+    timestamp = Column(
+        DateTime().with_variant(sqlite.DATETIME(
+            storage_format='%(year)04d-%(month)02d-%(day)02d '
+                           '%(hour)02d:%(minute)02d:%(second)02d'
+        ), 'sqlite'),
+        default=func.now()
+    )
+    image_status = Column(String(10), nullable=False, default=IMAGE_NONE,
+                          info={'backfill': IMAGE_PENDING})
+    image_variants = Column(String(50))
+    image_size = Column(Integer)
     image_url = None
+    image_variant_urls = None
 
     user = relationship('User')
     space = relationship('Space')
@@ -27,6 +55,16 @@ class Share(Base):
         self.space_id = space_id
         self.user_id = user_id
         self.text = text
+        self.image_status = self.IMAGE_NONE
+
+    def is_backfilled(self):
+        """
+        Check if the share's image status is the one backfilled for shares
+        created before it was tracked, so it's not known whether there's an image.
+        Returns:
+            bool: True for a backfilled share, False otherwise.
+        """
+        return self.image_status == self.IMAGE_PENDING and self.image_size is None
 
     def to_dict(self):
         """
@@ -40,7 +78,9 @@ class Share(Base):
             'user': self.user.to_dict(),
             'text': self.text,
             'timestamp': self.timestamp.isoformat(),
-            'image_url': self.image_url
+            'image_url': self.image_url,
+            'image_status': self.image_status,
+            'image_variants': self.image_variant_urls
         }
 
     def shares_to_dict(self):
@@ -54,7 +94,12 @@ class Share(Base):
             'user': self.user.to_dict(),
             'text': self.text,
             'timestamp': self.timestamp.isoformat(),
-            'image_url': self.image_url
+            'image_url': self.image_url,
+            'image_status': self.image_status,
+            'image_variants': self.image_variant_urls
         }
 
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        Index('ix_shares_space_id_timestamp_id', 'space_id', 'timestamp', 'id'),
+        {"sqlite_autoincrement": True}
+    )
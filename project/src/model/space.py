@@ -9,14 +9,21 @@ class Space(Base):
     """
     Model class representing individual spaces.
     This class defines the structure of the Space entity.
+    A space being removed by a background deletion job has the 'deleting' status
+    and is treated as if it no longer existed.
     """
     __tablename__ = 'spaces'
 
+    STATUS_ACTIVE = 'active'
+    STATUS_DELETING = 'deleting'
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=False)
+    status = Column(String(10), nullable=False, default=STATUS_ACTIVE)
 
     def __init__(self, name):
         self.name = name
+        self.status = self.STATUS_ACTIVE
 
     def to_dict(self):
         """
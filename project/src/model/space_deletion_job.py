@@ -0,0 +1,60 @@
+"""
+Module containing the SpaceDeletionJob model class.
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from ..model.base import Base
+
+
+class SpaceDeletionJob(Base):
+    """
+    This class defines the structure of the SpaceDeletionJob entity,
+    which tracks the background deletion of a space.
+    'status' is 'pending' until a worker picks the job up, 'running' while
+    the space's shares, images and rows are being removed, then 'done' or 'failed'.
+    'owner' identifies the process running the job ('<host>:<pid>') and 'attempts'
+    counts the runs, so a job is claimed by a single process. While the job runs,
+    its owner keeps refreshing 'updated_at' (UTC) as a lease.
+    'space_id' is kept without a foreign key, since the space row is deleted by the job.
+    """
+    __tablename__ = 'space_deletion_jobs'
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    space_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    status = Column(String(10), nullable=False, default=STATUS_PENDING, index=True)
+    deleted_shares = Column(Integer, nullable=False, default=0)
+    deleted_images = Column(Integer, nullable=False, default=0)
+    owner = Column(String(255))
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, space_id, user_id):
+        self.space_id = space_id
+        self.user_id = user_id
+        self.status = self.STATUS_PENDING
+        self.deleted_shares = 0
+        self.deleted_images = 0
+        self.attempts = 0
+
+    def to_dict(self):
+        """
+        Convert a SpaceDeletionJob object to a dictionary representation.
+        Returns:
+            dict: A dictionary containing the job's status and progress.
+        """
+        return {
+            'id': self.id,
+            'space_id': self.space_id,
+            'status': self.status,
+            'deleted_shares': self.deleted_shares,
+            'deleted_images': self.deleted_images
+        }
+
+    __table_args__ = {"sqlite_autoincrement": True}
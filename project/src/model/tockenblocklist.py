@@ -1,7 +1,7 @@
 """
 Module containing the TokenBlocklist model class.
 """
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, DateTime
 from ..model.base import Base
 
 
@@ -10,6 +10,7 @@ class TokenBlocklist(Base):
     This class defines the structure of the TokenBlocklist.
     It keeps track who revoked a JWT token.
     'jti'' stands for JWTs unique identifier
+    'expires_at' is the token expiry, after which the entry can be purged
     For more info check: 
     https://flask-jwt-extended.readthedocs.io/en/stable/blocklist_and_token_revoking.html
     """
@@ -17,8 +18,10 @@ class TokenBlocklist(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     jti = Column(String(36), nullable=False, index=True)
+    expires_at = Column(DateTime, index=True)
 
-    def __init__(self, jti):
+    def __init__(self, jti, expires_at=None):
         self.jti = jti
+        self.expires_at = expires_at
 
     __table_args__ = {"sqlite_autoincrement": True}
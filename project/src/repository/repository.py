@@ -35,6 +35,41 @@ class Repository(ABC):
             obj_id: The ID of the object to be deleted.
         """
 
+    @abstractmethod
+    def delete_all_by_filter(self, model, query_filter):
+        """
+        Abstract method to delete all objects matching a filter in a single statement.
+        Args:
+            model: The model class representing the type of objects to be deleted.
+            query_filter: The filter condition for the query.
+        Returns:
+            int: The number of deleted objects.
+        """
+
+    @abstractmethod
+    def delete_all_by_filters(self, deletions):
+        """
+        Abstract method to delete objects of several models in a single transaction,
+        with one statement per model. Either all of them are deleted or none.
+        Args:
+            deletions (list): (model, query_filter) tuples, deleted in the given order.
+        Returns:
+            int: The total number of deleted objects.
+        """
+
+    @abstractmethod
+    def update_all_by_filter(self, model, query_filter, values):
+        """
+        Abstract method to update all objects matching a filter in a single statement.
+        Since the filter is checked by the database, it can serve as a compare-and-set.
+        Args:
+            model: The model class representing the type of objects to be updated.
+            query_filter: The filter condition for the query.
+            values (dict): The new values of the columns, by attribute name.
+        Returns:
+            int: The number of updated objects.
+        """
+
     @abstractmethod
     def get_by_id(self, model, obj_id):
         """
@@ -70,12 +105,45 @@ class Repository(ABC):
         """
 
     @abstractmethod
-    def get_all_by_filter(self, model, query_filter):
+    def get_first_with_outer_join(self, model, joined_model, join_condition, query_filter):
+        """
+        Abstract method to retrieve the first object from the database based on a filter,
+        together with the object of another model outer joined to it.
+        Args:
+            model: The model class representing the type of object to be retrieved.
+            joined_model: The model class to be outer joined.
+            join_condition: The condition on which the models are joined.
+            query_filter: The filter condition for the query.
+        Returns:
+            tuple: The retrieved object and the joined object (None when not matched),
+            or None if no object matches the filter.
+        """
+
+    @abstractmethod
+    def get_all_by_filter(self, model, query_filter, eager_load=None):
         """
         Abstract method to retrieve all objects from the database based on a filter.
         Args:
             model: The model class representing the type of objects to be retrieved.
             query_filter: The filter condition for the query.
+            eager_load (list, optional): The relationships to be loaded within the same query.
+        Returns:
+            list: A list of retrieved objects.
+        """
+
+    @abstractmethod
+    def get_all_by_filter_ordered(self, model, query_filter, order_by, limit=None,
+                                  offset=None, eager_load=None):
+        """
+        Abstract method to retrieve objects from the database based on a filter,
+        sorted and optionally truncated by the database.
+        Args:
+            model: The model class representing the type of objects to be retrieved.
+            query_filter: The filter condition for the query.
+            order_by (list): The ordering clauses, most significant first.
+            limit (int, optional): The maximum number of objects to retrieve.
+            offset (int, optional): The number of objects to skip.
+            eager_load (list, optional): The relationships to be loaded within the same query.
         Returns:
             list: A list of retrieved objects.
         """
@@ -92,9 +160,26 @@ class Repository(ABC):
             list: A list of retrieved objects.
         """
 
+    @abstractmethod
+    def count_all(self, model):
+        """
+        Abstract method to count all objects of a model in the database.
+        Args:
+            model: The model class representing the type of objects to be counted.
+        Returns:
+            int: The number of objects.
+        """
+
     @abstractmethod
     def create_schema(self):
         """
-        Create a schema according to the model entities. 
+        Create a schema according to the model entities.
         Defines the data structure and relationships.
         """
+
+    @abstractmethod
+    def remove_session(self):
+        """
+        Close the session bound to the current request or thread
+        and return its connection to the pool.
+        """
@@ -1,8 +1,8 @@
 """
 Module containing the SqlAlchemyRepository class.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, inspect, literal, text
+from sqlalchemy.orm import sessionmaker, scoped_session, joinedload
 
 from ..repository.repository import Repository
 from ..model.base import Base
@@ -10,31 +10,75 @@ from ..model.user import User
 from ..model.space import Space
 from ..model.assignment import Assignment
 from ..model.share import Share
+from ..model.space_deletion_job import SpaceDeletionJob
+from ..model.tockenblocklist import TokenBlocklist
 
 
 class SqlAlchemyRepository(Repository):
     """
     Concrete implementation of the Repository abstract class using SQLAlchemy.
-    This class provides methods for adding, deleting, and retrieving objects 
+    This class provides methods for adding, deleting, and retrieving objects
     from a database using SQLAlchemy.
+    Every thread (and so every request) works on its own session taken from
+    a scoped session registry, backed by a shared connection pool.
+    Creating the schema also adds the columns and indexes missing from tables
+    created by an earlier version of the models, so it can run on every startup.
+    The rows of a table get the default of a new column, or the value in the
+    column's info['backfill'] when they need another one.
     """
 
-    def __init__(self, repository_url):
-        self.engine = create_engine(repository_url)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+    def __init__(self, repository_url, pool_options=None):
+        self.engine = create_engine(repository_url, **(pool_options or {}))
+        self.session = scoped_session(sessionmaker(bind=self.engine))
 
     def add(self, obj):
-        self.session.add(obj)
-        self.session.commit()
+        try:
+            self.session.add(obj)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
         self.session.refresh(obj)
         return obj.id
 
     def delete_by_id(self, model, obj_id):
         obj = self.get_by_id(model, obj_id)
         if obj:
-            self.session.delete(obj)
+            try:
+                self.session.delete(obj)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+
+    def delete_all_by_filter(self, model, query_filter):
+        try:
+            count = self.session.query(model).filter(query_filter).delete()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return count
+
+    def delete_all_by_filters(self, deletions):
+        try:
+            count = sum(self.session.query(model).filter(query_filter).delete()
+                        for model, query_filter in deletions)
             self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return count
+
+    def update_all_by_filter(self, model, query_filter, values):
+        try:
+            count = self.session.query(model).filter(query_filter).update(
+                values, synchronize_session=False)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return count
 
     def get_by_id(self, model, obj_id):
         return self.session.get(model, obj_id)
@@ -45,11 +89,67 @@ class SqlAlchemyRepository(Repository):
     def get_first_by_two_filters(self, model, query_filter1, query_filter2):
         return self.session.query(model).filter(query_filter1).filter(query_filter2).first()
 
-    def get_all_by_filter(self, model, query_filter):
-        return self.session.query(model).filter(query_filter).all()
+    def get_first_with_outer_join(self, model, joined_model, join_condition, query_filter):
+        return self.session.query(model, joined_model).outerjoin(
+            joined_model, join_condition).filter(query_filter).first()
+
+    def get_all_by_filter(self, model, query_filter, eager_load=None):
+        return self.__query(model, eager_load).filter(query_filter).all()
+
+    def get_all_by_filter_ordered(self, model, query_filter, order_by, limit=None,
+                                  offset=None, eager_load=None):
+        query = self.__query(model, eager_load).filter(
+            query_filter).order_by(*order_by)
+        if limit is not None:
+            query = query.limit(limit)
+        if offset is not None:
+            query = query.offset(offset)
+        return query.all()
 
     def get_all_by_two_filters(self, model, query_filter1, query_filter2):
         return self.session.query(model).filter(query_filter1).filter(query_filter2).all()
 
+    def count_all(self, model):
+        return self.session.query(model).count()
+
     def create_schema(self):
         Base.metadata.create_all(self.engine)
+        self.__add_missing_columns()
+
+    def __add_missing_columns(self):
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        connection.execute(text(
+                            f'ALTER TABLE {preparer.format_table(table)} '
+                            f'ADD COLUMN {self.__get_column_definition(column)}'))
+                        if 'backfill' in column.info:
+                            connection.execute(table.update().values(
+                                {column.name: column.info['backfill']}))
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+
+    def __get_column_definition(self, column):
+        definition = f'{self.engine.dialect.identifier_preparer.format_column(column)} ' \
+            f'{column.type.compile(dialect=self.engine.dialect)}'
+        # Existing rows get the default, so a column without one must allow NULL.
+        if column.default is not None and column.default.is_scalar:
+            default = literal(column.default.arg, column.type).compile(
+                dialect=self.engine.dialect, compile_kwargs={'literal_binds': True})
+            definition += f' DEFAULT {default}'
+            if not column.nullable:
+                definition += ' NOT NULL'
+        return definition
+
+    def remove_session(self):
+        self.session.remove()
+
+    def __query(self, model, eager_load):
+        query = self.session.query(model)
+        for relationship in eager_load or []:
+            query = query.options(joinedload(relationship))
+        return query
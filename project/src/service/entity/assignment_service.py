@@ -3,9 +3,11 @@ Module containing the AssignmentService class.
 """
 from flask_jwt_extended import jwt_required
 from injector import inject
+from sqlalchemy import select, func, and_
 
 from ...repository.repository import Repository
 from ...model.assignment import Assignment
+from ...model.space import Space
 from ..helper.service_validator import ServiceValidator
 from ...exception.service.service_exception import ServiceException
 
@@ -16,26 +18,36 @@ class AssignmentService():
     and their associated permissions. The methods make use of the Flask-JWT-Extended
     extension for authentication and utilizes validation methods.
     """
+    MAX_PAGE_SIZE = 100
+
     @inject
     def __init__(self, repository: Repository,  validator: ServiceValidator):
         self.repository = repository
         self.validator = validator
 
     @jwt_required()
-    def get_users_assignments(self):
+    def get_users_assignments(self, limit=None, offset=None):
         """
-        Fetch assignments belonging to the current user. 
-        Sort them in alphabetical order by space name.
+        Fetch assignments belonging to the current user, except those of spaces being deleted.
+        Sort them in alphabetical order by space name, case-insensitive.
+        Args:
+            limit (int, optional): The maximum number of assignments to fetch.
+            offset (int, optional): The number of assignments to skip.
         Returns:
             List[Assignment]: User's assignment objects.
         """
-        assignments = self.repository.get_all_by_filter(
+        self.validator.validate_page(limit, self.MAX_PAGE_SIZE, offset)
+        space_name = select(func.lower(Space.name)).where(
+            Space.id == Assignment.space_id).scalar_subquery()
+        return self.repository.get_all_by_filter_ordered(
             Assignment,
-            Assignment.user_id == self.validator.get_logged_in_user_id()
+            and_(Assignment.user_id == self.validator.get_logged_in_user_id(),
+                 Assignment.space.has(Space.status != Space.STATUS_DELETING)),
+            [space_name, Assignment.id],
+            limit=limit,
+            offset=offset,
+            eager_load=[Assignment.space]
         )
-        assignments = sorted(
-            assignments, key=lambda assignment: assignment.space.name.lower())
-        return assignments
 
     @jwt_required()
     def get_assignments_by_space_id(self, space_id):
@@ -46,13 +58,11 @@ class AssignmentService():
         Returns:
             List[Assignment]: Assignments within the specified space.
         """
-        user = self.validator.validate_user(
-            self.validator.get_logged_in_user_id())
-        space = self.validator.validate_space(space_id)
-        self.validator.validate_assignment(space, user)
+        space, _ = self.validator.validate_membership(space_id)
         return self.repository.get_all_by_filter(
             Assignment,
-            Assignment.space_id == space.id
+            Assignment.space_id == space.id,
+            eager_load=[Assignment.user]
         )
 
     @jwt_required()
@@ -64,12 +74,8 @@ class AssignmentService():
             member_login (str): Login of the user to be assigned.
         """
         self.validator.validate_not_null(member_login, 'Login')
-        space = self.validator.validate_space(space_id)
-        caller_assignment = self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        space, caller_assignment = self.validator.validate_membership(
+            space_id)
         self.validator.validate_admin(caller_assignment)
         user = self.validator.validate_user_by_login(member_login)
         self.validator.validate_no_assignment(
@@ -86,16 +92,12 @@ class AssignmentService():
             space_id (int): ID of the target space.
             user_id (int): ID of the user associated with the assignment.
         """
-        space = self.validator.validate_space(space_id)
+        space, caller_assignment = self.validator.validate_membership(
+            space_id)
         to_be_deleted_assignment = self.validator.validate_assignment(
             space,
             self.validator.validate_user(user_id)
         )
-        caller_assignment = self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
         if to_be_deleted_assignment == caller_assignment:
             if caller_assignment.is_admin:
                 raise ServiceException(
@@ -114,12 +116,8 @@ class AssignmentService():
             is_admin (bool): New admin permission status for the user.
         """
         self.validator.validate_not_null(is_admin, 'Is admin')
-        space = self.validator.validate_space(space_id)
-        caller_assignment = self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        space, caller_assignment = self.validator.validate_membership(
+            space_id)
         self.validator.validate_admin(caller_assignment)
         assignment = self.validator.validate_assignment(
             space,
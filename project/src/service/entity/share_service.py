@@ -4,12 +4,14 @@ Module containing the ShareService class.
 
 from flask_jwt_extended import jwt_required
 from injector import inject
+from sqlalchemy import and_, tuple_
 
 from ...repository.repository import Repository
 from ..image.image_service import ImageService
 from ...model.share import Share
 from ..helper.service_validator import ServiceValidator
 from ..helper.input_validator import validate_usr_input
+from ...exception.service.service_exception import ServiceException
 
 
 class ShareService():
@@ -20,6 +22,7 @@ class ShareService():
     """
 
     MAX_TEXT_LEN = 200
+    MAX_PAGE_SIZE = 100
 
     @inject
     def __init__(self, repository: Repository,
@@ -39,17 +42,14 @@ class ShareService():
             int: The ID of the newly created share.
         """
         validate_usr_input(text, 'Text', self.MAX_TEXT_LEN)
-        self.validator.validate_assignment(
-            self.validator.validate_space(space_id),
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        self.validator.validate_membership(space_id)
         return self.repository.add(Share(space_id, self.validator.get_logged_in_user_id(), text))
 
     @jwt_required()
     def get_share_by_share_id(self, share_id):
         """
-        Retrieve a share by its share ID, validate ownership, and get the associated image URL.
+        Retrieve a share by its share ID, validate ownership, and get the associated image URL
+        and the URLs of its size variants.
         Args:
             share_id (int): The ID of the share to retrieve.
         Returns:
@@ -59,32 +59,69 @@ class ShareService():
         self.validator.validate_share_owner(
             share, int(self.validator.get_logged_in_user_id()))
         share.image_url = self.image_service.get_image(share)
+        share.image_variant_urls = self.image_service.get_image_variants(share)
         return share
 
     @jwt_required()
-    def get_shares_by_space_id(self, space_id):
+    def get_image_status(self, share_id):
+        """
+        Retrieve the status and the stored size of a share's image after owner validation.
+        Unlike get_share_by_share_id, this doesn't touch the image storage,
+        so it's cheap to poll.
+        Args:
+            share_id (int): ID of the target share.
+        Returns:
+            dict: 'image_status' and 'image_size' (in bytes) of the share.
+        """
+        share = self.validator.validate_share(share_id)
+        self.validator.validate_share_owner(
+            share, int(self.validator.get_logged_in_user_id()))
+        return {'image_status': share.image_status, 'image_size': share.image_size}
+
+    @jwt_required()
+    def get_shares_by_space_id(self, space_id, limit=None, before=None, after=None):
         """
         Retrieve shares associated with a specific space based on its ID, validate user access
         and retrieve the image URL associated with each share. Sort the shares desc by timestamp.
+        Shares can be paginated with a keyset: the IDs of shares from a previous page
+        serve as cursors.
         Args:
             space_id (int): The ID of the space for which shares should be retrieved.
+            limit (int, optional): The maximum number of shares to retrieve.
+            before (int, optional): ID of a share, only shares older than it are retrieved.
+            after (int, optional): ID of a share, only shares newer than it are retrieved.
         Returns:
             list of Share: A list of Share objects representing the shares associated with the
             specified space, each with the image URL included.
         """
-        self.validator.validate_assignment(
-            self.validator.validate_space(space_id),
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
-        shares = self.repository.get_all_by_filter(
-            Share, Share.space_id == space_id)
-        shares = sorted(
-            shares, key=lambda share: share.timestamp, reverse=True)
+        self.validator.validate_membership(space_id)
+        self.validator.validate_page(limit, self.MAX_PAGE_SIZE)
+        query_filter = Share.space_id == space_id
+        order_by = [Share.timestamp.desc(), Share.id.desc()]
+        if before is not None:
+            query_filter = and_(
+                query_filter,
+                tuple_(Share.timestamp, Share.id) < self.__get_keyset(space_id, before))
+        if after is not None:
+            query_filter = and_(
+                query_filter,
+                tuple_(Share.timestamp, Share.id) > self.__get_keyset(space_id, after))
+            order_by = [Share.timestamp, Share.id]
+        shares = self.repository.get_all_by_filter_ordered(
+            Share, query_filter, order_by, limit=limit, eager_load=[Share.user])
+        if after is not None:
+            shares.reverse()
         for share in shares:
             share.image_url = self.image_service.get_image(share)
+            share.image_variant_urls = self.image_service.get_image_variants(share)
         return shares
 
+    def __get_keyset(self, space_id, share_id):
+        share = self.repository.get_by_id(Share, share_id)
+        if not share or share.space_id != space_id:
+            raise ServiceException(f"Invalid cursor '{share_id}'", 400)
+        return share.timestamp, share.id
+
     @jwt_required()
     def delete_share_by_share_id(self, share_id):
         """
@@ -116,13 +153,13 @@ class ShareService():
         share.text = text
         return self.repository.add(share)
 
-    @jwt_required()
-    def delete_shares_by_space_id(self, space_id):
+    def mark_image_ready(self, share_id):
         """
-        Delete all shares associated with a specific space by its ID.
+        Mark the image of a share as ready, once the distributor has put it
+        into the storage.
         Args:
-            space_id (int): ID of the target space.
+            share_id (int): ID of the target share.
         """
-        shares = self.get_shares_by_space_id(space_id)
-        for share in shares:
-            self.repository.delete_by_id(Share, share.id)
+        share = self.validator.validate_share(share_id)
+        share.image_status = Share.IMAGE_READY
+        self.repository.add(share)
@@ -6,12 +6,14 @@ from flask_jwt_extended import jwt_required
 from injector import inject
 
 from ...repository.repository import Repository
-from ..image.image_service import ImageService
 from .assignment_service import AssignmentService
-from .share_service import ShareService
 from ...model.space import Space
+from ...model.space_deletion_job import SpaceDeletionJob
 from ..helper.service_validator import ServiceValidator
+from ..helper.space_deletion_worker import SpaceDeletionWorker
 from ..helper.input_validator import validate_usr_input
+from ...exception.service.not_found_exception import NotFoundException
+from ...exception.service.forbidden_exception import ForbiddenException
 
 
 class SpaceService():
@@ -20,6 +22,7 @@ class SpaceService():
     The methods are designed to work with Flask-JWT-Extended for authentication.
     It utilizes validation methods and makes use of ImageService to work with images. 
     Additionally, the AssignmentService class is used to perform assignment-related actions.
+    Spaces are deleted in the background by the SpaceDeletionWorker.
     """
 
     MAX_NAME_LEN = 15
@@ -27,15 +30,13 @@ class SpaceService():
     @inject
     def __init__(self,
                  repository: Repository,
-                 image_service: ImageService,
                  assignment_service: AssignmentService,
-                 share_service: ShareService,
-                 validator: ServiceValidator):
+                 validator: ServiceValidator,
+                 deletion_worker: SpaceDeletionWorker):
         self.repository = repository
-        self.image_service = image_service
         self.assignment_service = assignment_service
-        self.share_service = share_service
         self.validator = validator
+        self.deletion_worker = deletion_worker
 
     @jwt_required()
     def create_space(self, name):
@@ -59,33 +60,47 @@ class SpaceService():
         Returns:
             Space: The space object.
         """
-        space = self.validator.validate_space(space_id)
-        self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        space, _ = self.validator.validate_membership(space_id)
         return space
 
     @jwt_required()
     def delete_space_by_space_id(self, space_id):
         """
-        Delete a space by its ID after validations and admin check.
+        Start deleting a space by its ID after validations and admin check.
+        The space is hidden right away and removed by a background job, which also
+        removes the admin's assignment. Deleting a space already being deleted
+        returns its job, or starts a new one if the last job failed.
         Args:
             space_id (int): ID of the target space.
+        Returns:
+            SpaceDeletionJob: The job deleting the space.
         """
-        space = self.validator.validate_space(space_id)
-        assignment = self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        space, assignment = self.validator.validate_membership(
+            space_id, include_deleting=True)
         self.validator.validate_admin(assignment)
-        if self.validator.contains_only_owner(space):
-            self.share_service.delete_shares_by_space_id(space_id)
-            self.assignment_service.delete_assignment(assignment)
-            self.repository.delete_by_id(Space, space_id)
-            self.image_service.delete_space_directory(space)
+        user_id = self.validator.get_logged_in_user_id()
+        if space.status == Space.STATUS_DELETING:
+            return self.deletion_worker.retry(space.id, user_id)
+        self.validator.contains_only_owner(space)
+        space.status = Space.STATUS_DELETING
+        self.repository.add(space)
+        return self.deletion_worker.start(space.id, user_id)
+
+    @jwt_required()
+    def get_deletion_job(self, job_id):
+        """
+        Retrieve a space deletion job by its ID, if the logged-in user started it.
+        Args:
+            job_id (int): ID of the target job.
+        Returns:
+            SpaceDeletionJob: The job object.
+        """
+        job = self.repository.get_by_id(SpaceDeletionJob, job_id)
+        if not job:
+            raise NotFoundException('No such job')
+        if job.user_id != self.validator.get_logged_in_user_id():
+            raise ForbiddenException('Can\'t access this job')
+        return job
 
     @jwt_required()
     def rename_space(self, space_id, new_name):
@@ -97,12 +112,7 @@ class SpaceService():
         """
         self.validator.validate_not_null(new_name, 'New name')
         validate_usr_input(new_name, 'Name', self.MAX_NAME_LEN)
-        space = self.validator.validate_space(space_id)
-        assignment = self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        space, assignment = self.validator.validate_membership(space_id)
         self.validator.validate_admin(assignment)
 
         space.name = new_name
@@ -1,6 +1,7 @@
 """
 Module containing the UserService class.
 """
+from datetime import datetime
 import bcrypt
 from flask_jwt_extended import jwt_required
 from flask_jwt_extended import create_access_token
@@ -11,9 +12,9 @@ from ...exception.service.service_exception import ServiceException
 from ...exception.service.unauthorized_exception import UnauthorizedException
 from ...repository.repository import Repository
 from ..helper.service_validator import ServiceValidator
+from ..helper.token_blocklist_cache import TokenBlocklistCache
 from ..helper.input_validator import validate_usr_input
 from ...model.user import User
-from ...model.tockenblocklist import TokenBlocklist
 
 
 class UserService():
@@ -27,9 +28,11 @@ class UserService():
     MAX_PASSWORD_LEN = 99999
 
     @inject
-    def __init__(self, repository: Repository, validator: ServiceValidator):
+    def __init__(self, repository: Repository, validator: ServiceValidator,
+                 token_blocklist_cache: TokenBlocklistCache):
         self.repository = repository
         self.validator = validator
+        self.token_blocklist_cache = token_blocklist_cache
 
     def login(self, user_login, password):
         """
@@ -43,7 +46,10 @@ class UserService():
         user = self.__get_verified_user(user_login, password)
         if not user:
             raise UnauthorizedException('Wrong login and/or password')
-        return create_access_token(identity=user.login)
+        return create_access_token(
+            identity=user.login,
+            additional_claims={'user_id': user.id}
+        )
 
     def create_user(self, user_login, password, confirm_password):
         """
@@ -70,8 +76,9 @@ class UserService():
         """
         Log out the currently logged-in user.
         """
-        jti = get_jwt()["jti"]
-        self.repository.add(TokenBlocklist(jti))
+        token = get_jwt()
+        self.token_blocklist_cache.revoke(
+            token["jti"], datetime.utcfromtimestamp(token["exp"]))
 
     @jwt_required()
     def change_password(self, old_password, new_password, confirm_password):
@@ -86,8 +93,7 @@ class UserService():
         self.validator.validate_not_null(new_password, 'New password')
         self.validator.validate_not_null(confirm_password, 'Confirm password')
         validate_usr_input(new_password, 'New password', self.MAX_PASSWORD_LEN)
-        session_user = self.repository.get_by_id(
-            User, self.validator.get_logged_in_user_id())
+        session_user = self.validator.get_logged_in_user()
         if not self.__verify_password(session_user, old_password):
             raise UnauthorizedException('Wrong password')
         if new_password != confirm_password:
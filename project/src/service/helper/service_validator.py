@@ -1,8 +1,10 @@
 """
 Module containing the ServiceValidator class.
 """
+from flask import g
+from sqlalchemy import and_
 from injector import inject
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_jwt, get_jwt_identity
 
 from ...exception.service.service_exception import ServiceException
 from ...exception.service.not_found_exception import NotFoundException
@@ -34,7 +36,7 @@ class ServiceValidator():
             Space: The validated space object.
         """
         space = self.repository.get_by_id(Space, space_id)
-        if not space:
+        if not space or space.status == Space.STATUS_DELETING:
             raise NotFoundException(
                 f"Space with ID '{space_id}' doesn't exist")
         return space
@@ -70,13 +72,31 @@ class ServiceValidator():
 
     def get_logged_in_user_id(self):
         """
-        Retrieves user_id of the logged-in user based on the JWT identity.
+        Retrieves user_id of the logged-in user based on the JWT claims.
+        Tokens issued without the 'user_id' claim fall back to a lookup by identity.
         Returns:
             int: The user id.
         """
-        user = self.repository.get_first_by_filter(
-            User, User.login == get_jwt_identity())
-        return user.id
+        user_id = get_jwt().get('user_id')
+        if user_id is not None:
+            return user_id
+        return self.get_logged_in_user().id
+
+    def get_logged_in_user(self):
+        """
+        Validate and retrieve the logged-in user. The user is resolved once
+        per request and cached on `flask.g` for every later call.
+        Returns:
+            User: The validated user object.
+        """
+        if 'logged_in_user' not in g:
+            user_id = get_jwt().get('user_id')
+            if user_id is not None:
+                g.logged_in_user = self.validate_user(user_id)
+            else:
+                g.logged_in_user = self.validate_user_by_login(
+                    get_jwt_identity())
+        return g.logged_in_user
 
     def validate_assignment(self, space, user):
         """
@@ -93,6 +113,33 @@ class ServiceValidator():
             raise ForbiddenException('Can\'t access this space - not a member')
         return assignment
 
+    def validate_membership(self, space_id, include_deleting=False):
+        """
+        Validate if space exists and the logged-in user is its member.
+        Both are resolved with a single joined query. A space being deleted doesn't exist,
+        unless include_deleting is set.
+        Args:
+            space_id (int): ID of the target space.
+            include_deleting (bool, optional): Whether a space being deleted is accepted.
+        Returns:
+            tuple: The validated space object and the logged-in user's assignment object.
+        """
+        result = self.repository.get_first_with_outer_join(
+            Space,
+            Assignment,
+            and_(Assignment.space_id == Space.id,
+                 Assignment.user_id == self.get_logged_in_user_id()),
+            Space.id == space_id
+        )
+        if not result or (result[0].status == Space.STATUS_DELETING
+                           and not include_deleting):
+            raise NotFoundException(
+                f"Space with ID '{space_id}' doesn't exist")
+        space, assignment = result
+        if not assignment:
+            raise ForbiddenException('Can\'t access this space - not a member')
+        return space, assignment
+
     def validate_no_assignment(self, space, user):
         """
         Validate that no assignment exists for a specific space-user pair.
@@ -162,6 +209,20 @@ class ServiceValidator():
         if usr_input is None:
             raise ServiceException(f"{input_name} must be provided", 400)
 
+    def validate_page(self, limit, max_limit, offset=None):
+        """
+        Validate pagination parameters provided by the user.
+        Args:
+            limit (int): The requested number of items, None if not requested.
+            max_limit (int): The maximum allowed number of items.
+            offset (int, optional): The requested number of items to skip.
+        """
+        if limit is not None and not 0 < limit <= max_limit:
+            raise ServiceException(
+                f"Limit must be between 1 and {max_limit}", 400)
+        if offset is not None and offset < 0:
+            raise ServiceException('Offset cannot be negative', 400)
+
     def validate_last_admin(self, assignment, is_admin):
         """
         Validate if space has at least one admin before changing admin permissions.
@@ -0,0 +1,174 @@
+"""
+Module containing the SpaceDeletionWorker class.
+"""
+import os
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import and_
+
+from ...repository.repository import Repository
+from ..image.image_service import ImageService
+from ...model.space import Space
+from ...model.share import Share
+from ...model.assignment import Assignment
+from ...model.space_deletion_job import SpaceDeletionJob
+
+logger = logging.getLogger(__name__)
+
+
+class SpaceDeletionWorker():
+    """
+    This class deletes spaces in the background, so a request doesn't have to wait
+    for the removal of a big space. A SpaceDeletionJob row records the progress.
+    The shares are deleted in batches, then the images, the remaining assignments
+    and the space row. Every step can safely run again, so jobs left unfinished
+    by a stopped process are resumed at startup.
+    Every application process resumes jobs, so a job is claimed before it runs,
+    with a compare-and-set on its attempts counter. A claim is a lease: while the
+    job runs, its 'updated_at' is refreshed every third of lease_timeout, and
+    running jobs are taken over only once it is older than lease_timeout, on any
+    host. Failed jobs are retried until they have run max_attempts times. After that, deleting the
+    space again starts a new job.
+    """
+
+    def __init__(self, repository: Repository, image_service: ImageService,
+                 batch_size, max_workers, max_attempts, lease_timeout):
+        self.repository = repository
+        self.image_service = image_service
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='space-deletion')
+
+    def start(self, space_id, user_id):
+        """
+        Create a deletion job for a space, already marked as deleting, and schedule it.
+        Args:
+            space_id (int): ID of the space to delete.
+            user_id (int): ID of the user who requested the deletion.
+        Returns:
+            SpaceDeletionJob: The created job.
+        """
+        job = SpaceDeletionJob(space_id, user_id)
+        self.repository.add(job)
+        self.executor.submit(self.__run, job.id, job.attempts)
+        return job
+
+    def retry(self, space_id, user_id):
+        """
+        Return the unfinished deletion job of a space already marked as deleting,
+        or start a new one if its last job failed.
+        Args:
+            space_id (int): ID of the space to delete.
+            user_id (int): ID of the user who requested the deletion.
+        Returns:
+            SpaceDeletionJob: The unfinished or the created job.
+        """
+        jobs = self.repository.get_all_by_filter_ordered(
+            SpaceDeletionJob, SpaceDeletionJob.space_id == space_id,
+            [SpaceDeletionJob.id.desc()], limit=1)
+        if jobs and jobs[0].status != SpaceDeletionJob.STATUS_FAILED:
+            return jobs[0]
+        return self.start(space_id, user_id)
+
+    def resume(self):
+        """
+        Schedule the jobs left unfinished by a previous run: pending jobs,
+        running jobs whose lease has expired and failed jobs with attempts left.
+        """
+        jobs = self.repository.get_all_by_filter(
+            SpaceDeletionJob, SpaceDeletionJob.status != SpaceDeletionJob.STATUS_DONE)
+        for job in jobs:
+            if self.__is_resumable(job):
+                self.executor.submit(self.__run, job.id, job.attempts)
+        self.repository.remove_session()
+
+    def __is_resumable(self, job):
+        if job.status == SpaceDeletionJob.STATUS_RUNNING:
+            return self.__is_lease_expired(job)
+        if job.status == SpaceDeletionJob.STATUS_FAILED:
+            return job.attempts < self.max_attempts
+        return True
+
+    def __is_lease_expired(self, job):
+        return (not job.updated_at
+                or job.updated_at < datetime.utcnow() - timedelta(seconds=self.lease_timeout))
+
+    def __claim(self, job_id, attempts):
+        return self.repository.update_all_by_filter(
+            SpaceDeletionJob,
+            and_(SpaceDeletionJob.id == job_id, SpaceDeletionJob.attempts == attempts),
+            {
+                'status': SpaceDeletionJob.STATUS_RUNNING,
+                'owner': f'{socket.gethostname()}:{os.getpid()}',
+                'attempts': attempts + 1,
+                'updated_at': datetime.utcnow()
+            }) == 1
+
+    def __heartbeat(self, job_id, attempts, stopped):
+        # The attempts counter identifies the claim, so a job taken over isn't renewed.
+        try:
+            while not stopped.wait(self.lease_timeout / 3):
+                self.repository.update_all_by_filter(
+                    SpaceDeletionJob,
+                    and_(SpaceDeletionJob.id == job_id,
+                         SpaceDeletionJob.attempts == attempts,
+                         SpaceDeletionJob.status == SpaceDeletionJob.STATUS_RUNNING),
+                    {'updated_at': datetime.utcnow()})
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Heartbeat of space deletion job %s failed', job_id)
+        finally:
+            self.repository.remove_session()
+
+    def __run(self, job_id, attempts):
+        stopped = threading.Event()
+        try:
+            if not self.__claim(job_id, attempts):
+                return
+            threading.Thread(
+                target=self.__heartbeat, args=(job_id, attempts + 1, stopped),
+                name=f'space-deletion-heartbeat-{job_id}', daemon=True).start()
+            job = self.repository.get_by_id(SpaceDeletionJob, job_id)
+            try:
+                self.__delete_space(job)
+                job.status = SpaceDeletionJob.STATUS_DONE
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Deletion of space %s failed', job.space_id)
+                self.repository.remove_session()
+                job = self.repository.get_by_id(SpaceDeletionJob, job_id)
+                job.status = SpaceDeletionJob.STATUS_FAILED
+                if job.attempts >= self.max_attempts:
+                    logger.error(
+                        'Deletion of space %s failed %s times, giving up until it is '
+                        'requested again', job.space_id, job.attempts)
+            self.repository.add(job)
+        finally:
+            stopped.set()
+            self.repository.remove_session()
+
+    def __delete_space(self, job):
+        space = self.repository.get_by_id(Space, job.space_id)
+        if not space:
+            return
+        while True:
+            shares = self.repository.get_all_by_filter_ordered(
+                Share, Share.space_id == space.id, [Share.id], limit=self.batch_size)
+            if not shares:
+                break
+            job.deleted_shares += self.repository.delete_all_by_filter(
+                Share, Share.id.in_([share.id for share in shares]))
+            self.repository.add(job)
+
+        def report_images(count):
+            job.deleted_images = count
+            self.repository.add(job)
+
+        self.image_service.delete_space_directory(space, report_images)
+        self.repository.delete_all_by_filters([
+            (Assignment, Assignment.space_id == space.id),
+            (Space, Space.id == space.id)
+        ])
@@ -0,0 +1,122 @@
+"""
+Module containing the TokenBlocklistCache class.
+"""
+import time
+from datetime import datetime
+from threading import Lock
+
+from ...repository.repository import Repository
+from ...model.tockenblocklist import TokenBlocklist
+
+
+class TokenBlocklistCache():
+    """
+    This class keeps the revoked JWT identifiers (jti) in process memory, in front
+    of the TokenBlocklist table, so checking a token needs no database query.
+    The cache is loaded at startup and then synced at a fixed interval by reading
+    the rows added since the last sync. This way tokens revoked by other
+    workers are picked up within one interval.
+    Ids are assigned before the rows are committed, so a row can become visible
+    after rows with higher ids. Every sync re-reads the last SYNC_OVERLAP ids
+    to pick up such rows.
+    Entries of tokens that have already expired are dropped from the cache and
+    can be purged from the table. Entries added before the expiry was recorded
+    get the latest expiry their token could have, token_lifetime from now.
+    """
+
+    SYNC_OVERLAP = 1000
+
+    def __init__(self, repository: Repository, sync_interval, token_lifetime):
+        self.repository = repository
+        self.sync_interval = sync_interval
+        self.token_lifetime = token_lifetime
+        self.revoked = {}
+        self.last_id = 0
+        self.synced_at = None
+        self.lock = Lock()
+
+    def is_revoked(self, jti):
+        """
+        Check if a token has been revoked.
+        Args:
+            jti (str): Unique identifier of the token.
+        Returns:
+            bool: True if the token is revoked, False otherwise.
+        """
+        if self.__is_stale():
+            self.sync()
+        return jti in self.revoked
+
+    def revoke(self, jti, expires_at):
+        """
+        Revoke a token by adding it to the TokenBlocklist table and to the cache.
+        Args:
+            jti (str): Unique identifier of the token.
+            expires_at (datetime): Expiry of the token (UTC).
+        """
+        self.repository.add(TokenBlocklist(jti, expires_at))
+        self.revoked[jti] = expires_at
+
+    def sync(self):
+        """
+        Load the tokens revoked since the last sync, and the trailing
+        SYNC_OVERLAP ids, into the cache and drop the expired ones. A sync already running in another
+        thread is not waited for.
+        """
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            tokens = self.repository.get_all_by_filter(
+                TokenBlocklist, TokenBlocklist.id > self.last_id - self.SYNC_OVERLAP)
+            for token in tokens:
+                self.revoked[token.jti] = token.expires_at
+                self.last_id = max(self.last_id, token.id)
+            self.__drop_expired()
+            self.synced_at = time.monotonic()
+        finally:
+            self.lock.release()
+
+    def backfill_expiry(self):
+        """
+        Set the expiry of the entries that have none, so they can be purged once
+        their token has surely expired. Tokens that never expire keep no expiry.
+        Returns:
+            int: The number of updated entries.
+        """
+        if not self.token_lifetime:
+            return 0
+        return self.repository.update_all_by_filter(
+            TokenBlocklist, TokenBlocklist.expires_at.is_(None),
+            {'expires_at': datetime.utcnow() + self.token_lifetime})
+
+    def purge_expired(self):
+        """
+        Delete the entries of already expired tokens from the TokenBlocklist table.
+        Entries without an expiry are backfilled first.
+        Returns:
+            int: The number of purged entries.
+        """
+        self.backfill_expiry()
+        count = self.repository.delete_all_by_filter(
+            TokenBlocklist, TokenBlocklist.expires_at < datetime.utcnow())
+        self.__drop_expired()
+        return count
+
+    def get_size(self):
+        """
+        Count the entries in the TokenBlocklist table.
+        Returns:
+            int: The number of entries.
+        """
+        return self.repository.count_all(TokenBlocklist)
+
+    def __drop_expired(self):
+        now = datetime.utcnow()
+        expired = [jti for jti, expires_at in list(self.revoked.items())
+                   if expires_at and expires_at < now]
+        for jti in expired:
+            self.revoked.pop(jti, None)
+
+    def __is_stale(self):
+        return self.synced_at is None or \
+            time.monotonic() - self.synced_at >= self.sync_interval
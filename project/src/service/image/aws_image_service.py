@@ -2,127 +2,360 @@
 Module containing the AWSImageService class.
 """
 import os
-import datetime
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from flask_jwt_extended import jwt_required
+from werkzeug.datastructures import FileStorage
 import boto3
+import botocore.config
 import botocore.exceptions
 
 
 from ..image.image_service import ImageService
+from ..image.s3_space_layout import S3BucketLayout, S3PrefixLayout
+from ..image.presigned_url_cache import PresignedUrlCache
+from ..image.image_upload_worker import ImageUploadWorker
+from ..image.image_distributor import ImageDistributor
+from ..image.image_normalizer import validate_image, normalize_image
+from ..image.image_variants import (
+    VARIANTS, create_variants, get_variant_key, is_variant_key
+)
 from ..helper.service_validator import ServiceValidator
+from ...exception.service.service_exception import ServiceException
+from ...repository.repository import Repository
+from ...model.share import Share
 
 
 class AwsImageService(ImageService):
     """
     Concrete implementation of the ImageService abstract class using an AWS client.
     This class provides methods for adding, deleting, and retrieving images 
-    to/from AWS and also managing AWS S3 buckets
+    to/from AWS and also managing AWS S3 buckets.
+    Images are normalized and uploaded to the temporary bucket in the background by
+    an ImageUploadWorker, together with their downscaled variants. Clients can also
+    upload an image straight to the temporary bucket with a presigned POST; once
+    confirmed, it's validated and goes through the same worker.
+    The S3 client is created once and shared by all threads. Uploaded images are
+    handed over to the distributor Lambda by an ImageDistributor.
+    Spaces are stored in S3 according to the S3_LAYOUT: a bucket per space ('bucket'),
+    or key prefixes in the single S3_BUCKET ('prefix').
     """
 
     FILE_FORMAT = '.jpg'
-    MEDIA_URL_EXPIRES_IN = 10
+    DELETE_BATCH_SIZE = 1000
+    DELETE_ATTEMPTS = 3
 
-    def __init__(self, app, validator: ServiceValidator):
-        self.queue_url = app.config['SQS_URL']
+    def __init__(self, app, repository: Repository, validator: ServiceValidator,
+                 distributor: ImageDistributor):
         self.s3_temp_bucket = app.config['S3_TEMP_BUCKET']
+        self.s3_bucket = app.config['S3_BUCKET']
         self.mode = app.config['MODE']
+        client_config = botocore.config.Config(
+            max_pool_connections=app.config['AWS_MAX_POOL_CONNECTIONS'],
+            retries={'max_attempts': app.config['AWS_MAX_ATTEMPTS'], 'mode': 'standard'}
+        )
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            config=client_config
+        )
+        if app.config['S3_LAYOUT'] == 'prefix':
+            self.layout = S3PrefixLayout(
+                self.s3_client, self.s3_bucket, self.__get_key_prefix())
+        else:
+            self.layout = S3BucketLayout(
+                self.s3_client,
+                self.__get_bucket_prefix(),
+                app.config['S3_BUCKET_CACHE_TTL']
+            )
+        self.url_cache = PresignedUrlCache(
+            self.s3_client,
+            app.config['MEDIA_URL_EXPIRES_IN'],
+            app.config['MEDIA_URL_RENEW_BEFORE']
+        )
+        self.upload_worker = ImageUploadWorker(
+            app.config['UPLOAD_SPOOL_DIR'],
+            app.config['UPLOAD_WORKERS'],
+            app.config['UPLOAD_RETRIES'],
+            self.__upload_spooled_image,
+            self.__on_upload_finished
         )
+        self.upload_url_expires_in = app.config['UPLOAD_URL_EXPIRES_IN']
+        self.upload_max_size = app.config['UPLOAD_MAX_SIZE']
+        self.image_max_dimension = app.config['IMAGE_MAX_DIMENSION']
+        self.image_quality = app.config['IMAGE_QUALITY']
+        self.delete_workers = app.config['S3_DELETE_WORKERS']
+        self.repository = repository
         self.validator = validator
+        self.distributor = distributor
 
     @jwt_required()
     def upload_image(self, file, share_id):
-        share = self.validator.validate_share(share_id)
-        self.validator.validate_share_owner(
-            share,
-            int(self.validator.get_logged_in_user_id())
-        )
+        share = self.__validate_owned_share(share_id)
+        validate_image(file)
+        object_key = self.__get_temp_object_key(share)
+        share.image_status = Share.IMAGE_UPLOADING
+        share.image_variants = None
+        share.image_size = None
+        self.repository.add(share)
+        self.layout.expect(share.space.id)
+        self.__invalidate_urls(share)
+        self.upload_worker.submit(file, object_key)
 
-        object_key = str(share.space.id) + '-' + \
-            str(share.id) + self.FILE_FORMAT
-        self.s3_client.upload_fileobj(
-            file,
-            self.s3_temp_bucket,
-            object_key
+    @jwt_required()
+    def create_upload_url(self, share_id):
+        share = self.__validate_owned_share(share_id)
+        upload = self.s3_client.generate_presigned_post(
+            Bucket=self.s3_temp_bucket,
+            Key=self.__get_temp_object_key(share),
+            Conditions=[['content-length-range', 1, self.upload_max_size]],
+            ExpiresIn=self.upload_url_expires_in
         )
-        self.__send_file_name_to_sqs(object_key)
+        share.image_status = Share.IMAGE_UPLOADING
+        self.repository.add(share)
+        return upload
+
+    @jwt_required()
+    def confirm_upload(self, share_id):
+        share = self.__validate_owned_share(share_id)
+        object_key = self.__get_temp_object_key(share)
+        try:
+            response = self.s3_client.get_object(Bucket=self.s3_temp_bucket, Key=object_key)
+        except botocore.exceptions.ClientError as ex:
+            if ex.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                raise ServiceException("Image hasn't been uploaded", 400) from ex
+            raise
+        file = FileStorage(BytesIO(response['Body'].read()))
+        validate_image(file)
+        share.image_status = Share.IMAGE_UPLOADING
+        share.image_variants = None
+        share.image_size = None
+        self.repository.add(share)
+        self.layout.expect(share.space.id)
+        self.__invalidate_urls(share)
+        self.upload_worker.submit(file, object_key)
 
     @jwt_required()
     def get_image(self, share):
-        bucket = self.__find_bucket(share.space_id)
-        if not bucket:
+        if share.image_status not in (Share.IMAGE_PENDING, Share.IMAGE_READY):
             return None
-        key = str(share.id) + self.FILE_FORMAT
+        location = self.layout.locate(share.space_id)
+        if not location:
+            return self.__mark_image_missing(share)
+        bucket, key = location[0], self.__get_share_key(location[1], share)
 
-        try:
-            self.s3_client.get_object(Bucket=bucket, Key=key)
-        except botocore.exceptions.ClientError as ex:
-            if ex.response['Error']['Code'] == 'NoSuchKey':
-                return None
+        if share.image_status == Share.IMAGE_PENDING:
+            if not self.__object_exists(bucket, key):
+                return self.__mark_image_missing(share)
+            share.image_status = Share.IMAGE_READY
+            self.repository.add(share)
 
         return self.__generate_presigned_url(bucket, key)
 
     @jwt_required()
-    def delete_space_directory(self, space):
-        bucket = self.__find_bucket(space.id)
-        if not bucket:
+    def get_image_variants(self, share):
+        if share.image_status != Share.IMAGE_READY:
+            return None
+        location = self.layout.locate(share.space_id)
+        if not location:
+            return None
+        bucket, key = location[0], self.__get_share_key(location[1], share)
+        urls = {'original': self.__generate_presigned_url(bucket, key)}
+        for name in (share.image_variants or '').split(','):
+            if name:
+                urls[name] = self.__generate_presigned_url(
+                    bucket, get_variant_key(key, name))
+        return urls
+
+    def delete_space_directory(self, space, progress=None):
+        location = self.layout.locate(space.id)
+        if not location:
             return
-        for obj in self.__get_all_objects(bucket):
-            self.s3_client.delete_object(Bucket=bucket, Key=obj['Key'])
-        self.s3_client.delete_bucket(Bucket=bucket)
+        bucket, prefix = location
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=self.delete_workers) as executor:
+            for count in executor.map(
+                    lambda keys: self.__delete_objects(bucket, keys),
+                    self.__get_key_batches(bucket, prefix)):
+                deleted += count
+                if progress:
+                    progress(deleted)
+        self.layout.remove(space.id)
 
     @jwt_required()
     def get_all_images(self, space_id):
-        space = self.validator.validate_space(space_id)
-        self.validator.validate_assignment(
-            space,
-            self.validator.validate_user(
-                self.validator.get_logged_in_user_id())
-        )
+        space, _ = self.validator.validate_membership(space_id)
 
-        bucket = self.__find_bucket(space.id)
+        location = self.layout.locate(space.id)
         image_urls = []
-        if bucket:
-            for obj in self.__get_all_objects(bucket):
-                image_urls.append(
-                    self.__generate_presigned_url(bucket, obj['Key']))
+        if location:
+            bucket, prefix = location
+            for obj in self.__get_all_objects(bucket, prefix):
+                if not is_variant_key(obj['Key'][len(prefix):]):
+                    image_urls.append(
+                        self.__generate_presigned_url(bucket, obj['Key']))
         return image_urls
 
     def create_temp_directory(self):
-        for bucket in self.s3_client.list_buckets()['Buckets']:
-            if bucket["Name"] == self.s3_temp_bucket:
-                return
-        self.s3_client.create_bucket(Bucket=self.s3_temp_bucket)
+        buckets = self.s3_client.list_buckets()['Buckets']
+        if not any(bucket["Name"] == self.s3_temp_bucket for bucket in buckets):
+            self.s3_client.create_bucket(Bucket=self.s3_temp_bucket)
+        self.layout.create()
+        self.upload_worker.resume()
+
+    def migrate_space_buckets(self, progress=None):
+        """
+        Move the images from the bucket-per-space layout into the S3_BUCKET
+        of the prefix layout, and delete the emptied buckets. Objects are deleted
+        only after they've been copied, so the migration can be run again,
+        e.g. after images have been distributed to the old buckets meanwhile.
+        Args:
+            progress (callable): Optional callback with the number of moved images so far.
+        Returns:
+            int: The number of moved images.
+        """
+        source = S3BucketLayout(self.s3_client, self.__get_bucket_prefix(), 0)
+        target = S3PrefixLayout(self.s3_client, self.s3_bucket, self.__get_key_prefix())
+        target.create()
+        moved = 0
+        with ThreadPoolExecutor(max_workers=self.delete_workers) as executor:
+            for space_id, bucket in source.get_all().items():
+                prefix = target.get_key_prefix(space_id)
+                for keys in self.__get_key_batches(bucket, ''):
+                    list(executor.map(
+                        lambda key, bucket=bucket, prefix=prefix:
+                            self.__copy_object(bucket, key, prefix + key),
+                        keys))
+                    moved += self.__delete_objects(bucket, keys)
+                    if progress:
+                        progress(moved)
+                self.s3_client.delete_bucket(Bucket=bucket)
+        return moved
+
+    def __validate_owned_share(self, share_id):
+        share = self.validator.validate_share(share_id)
+        self.validator.validate_share_owner(
+            share,
+            int(self.validator.get_logged_in_user_id())
+        )
+        return share
+
+    def __get_temp_object_key(self, share):
+        return str(share.space.id) + '-' + str(share.id) + self.FILE_FORMAT
+
+    def __get_share_key(self, prefix, share):
+        return prefix + str(share.id) + self.FILE_FORMAT
 
-    def __find_bucket(self, space_id):
-        prefix = 'space-id-'
+    def __invalidate_urls(self, share):
+        key = self.__get_share_key(self.layout.get_key_prefix(share.space.id), share)
+        self.url_cache.invalidate(key)
+        for name in VARIANTS:
+            self.url_cache.invalidate(get_variant_key(key, name))
+
+    def __get_bucket_prefix(self):
+        if self.mode == 'test':
+            return 'test-space-id-'
+        return 'space-id-'
+
+    def __get_key_prefix(self):
         if self.mode == 'test':
-            prefix = 'test-space-id-'
-        for bucket in self.s3_client.list_buckets()['Buckets']:
-            if bucket["Name"].startswith(prefix + str(space_id)):
-                return bucket["Name"]
+            return 'test-spaces/'
+        return 'spaces/'
+
+    def __upload_spooled_image(self, path, object_key):
+        image = normalize_image(path, self.image_max_dimension, self.image_quality)
+        # The original is sent only once the variants have been accepted, so it can't
+        # share a batch with them and be distributed while a variant failed.
+        futures = []
+        for name, file in create_variants(image, self.image_quality):
+            variant_key = get_variant_key(object_key, name)
+            self.s3_client.upload_fileobj(file, self.s3_temp_bucket, variant_key)
+            futures.append(self.distributor.distribute(variant_key))
+        for future in futures:
+            future.result()
+        size = image.getbuffer().nbytes
+        image.seek(0)
+        self.s3_client.upload_fileobj(image, self.s3_temp_bucket, object_key)
+        self.distributor.distribute(object_key).result()
+        return size
+
+    def __on_upload_finished(self, object_key, succeeded, size):
+        share_id = int(object_key[:-len(self.FILE_FORMAT)].split('-')[1])
+        try:
+            share = self.repository.get_by_id(Share, share_id)
+            if not share:
+                return
+            # The distributor may have marked the image as ready already.
+            if share.image_status in (Share.IMAGE_UPLOADING, Share.IMAGE_FAILED):
+                share.image_status = Share.IMAGE_PENDING if succeeded \
+                    else Share.IMAGE_FAILED
+            if succeeded:
+                share.image_variants = ','.join(VARIANTS)
+                share.image_size = size
+            self.repository.add(share)
+        finally:
+            self.repository.remove_session()
+
+    def __mark_image_missing(self, share):
+        # A backfilled share without a stored image never had one.
+        if share.is_backfilled():
+            share.image_status = Share.IMAGE_NONE
+            self.repository.add(share)
         return None
 
-    def __send_file_name_to_sqs(self, file_name):
-        boto3.client('sqs', region_name='us-east-1').send_message(
-            QueueUrl=self.queue_url,
-            MessageBody=file_name,
-            MessageGroupId=self.mode,
-            MessageDeduplicationId=str(datetime.datetime.now().timestamp())
+    def __object_exists(self, bucket, key):
+        return self.__get_object_size(bucket, key) is not None
+
+    def __get_object_size(self, bucket, key):
+        try:
+            response = self.s3_client.head_object(Bucket=bucket, Key=key)
+        except botocore.exceptions.ClientError as ex:
+            if ex.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return None
+            raise
+        return response['ContentLength']
+
+    def __get_all_objects(self, bucket, prefix):
+        for page in self.__get_pages(bucket, prefix):
+            yield from page.get('Contents', [])
+
+    def __get_key_batches(self, bucket, prefix):
+        for page in self.__get_pages(bucket, prefix):
+            keys = [obj['Key'] for obj in page.get('Contents', [])]
+            if keys:
+                yield keys
+
+    def __get_pages(self, bucket, prefix):
+        return self.s3_client.get_paginator('list_objects_v2').paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': self.DELETE_BATCH_SIZE}
         )
 
-    def __get_all_objects(self, bucket):
-        response = self.s3_client.list_objects_v2(Bucket=bucket)
-        if 'Contents' in response:
-            return response['Contents']
-        return []
+    def __copy_object(self, source_bucket, key, destination_key):
+        self.s3_client.copy_object(
+            CopySource={'Bucket': source_bucket, 'Key': key},
+            Bucket=self.s3_bucket,
+            Key=destination_key
+        )
+
+    def __delete_objects(self, bucket, keys):
+        deleted = 0
+        for _ in range(self.DELETE_ATTEMPTS):
+            response = self.s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+            )
+            failed = {error['Key'] for error in response.get('Errors', [])}
+            for key in keys:
+                if key not in failed:
+                    self.url_cache.invalidate(key)
+            deleted += len(keys) - len(failed)
+            keys = [key for key in keys if key in failed]
+            if not keys:
+                break
+        return deleted
 
     def __generate_presigned_url(self, bucket, key):
-        return self.s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': bucket, 'Key': key},
-            ExpiresIn=self.MEDIA_URL_EXPIRES_IN
-        )
+        return self.url_cache.get_url(bucket, key)
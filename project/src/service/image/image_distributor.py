@@ -0,0 +1,26 @@
+"""
+Module containing an ImageDistributor ABC (Abstract Base Class).
+"""
+from abc import ABC, abstractmethod
+
+
+class ImageDistributor(ABC):
+    """
+    Abstract base class for moving uploaded images from the temporary storage
+    to the storage of their spaces.
+    An image is given by its temporary key, <space_id>-<share_id>.jpg, or
+    <space_id>-<share_id>_<variant>.jpg for a size variant. Images of a share
+    are distributed in the order they were given, so variants sent before
+    their original are in place once the original is.
+    """
+
+    @abstractmethod
+    def distribute(self, object_key):
+        """
+        Schedule the distribution of an image from the temporary storage.
+        Args:
+            object_key (str): Temporary key of the image.
+        Returns:
+            Future: Resolved once the image has been accepted for distribution,
+            or with the exception if it couldn't be.
+        """
@@ -0,0 +1,64 @@
+"""
+Module containing functions to validate and normalize uploaded images.
+"""
+from io import BytesIO
+from PIL import Image, ImageOps
+
+from ...exception.service.service_exception import ServiceException
+
+NOT_AN_IMAGE = 'File must be an image'
+
+
+def validate_image(file):
+    """
+    Check that an uploaded file is an image Pillow can read, without decoding it.
+    Args:
+        file (file object): The uploaded file.
+    Raises:
+        ServiceException: If the file is not an image.
+    """
+    try:
+        with Image.open(file.stream) as image:
+            image.verify()
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as exc:
+        raise ServiceException(NOT_AN_IMAGE, 400) from exc
+    finally:
+        file.stream.seek(0)
+
+
+def normalize_image(path, max_dimension, quality):
+    """
+    Decode an image, apply its EXIF orientation, cap its dimensions and
+    recompress it as a progressive JPEG without metadata. The color profile is kept.
+    Args:
+        path (str): Path of the uploaded image.
+        max_dimension (int): Maximum width and height in pixels.
+        quality (int): JPEG quality.
+    Returns:
+        BytesIO: The normalized image.
+    Raises:
+        ServiceException: If the file is not an image.
+    """
+    try:
+        with Image.open(path) as image:
+            icc_profile = image.info.get('icc_profile')
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_dimension, max_dimension))
+            image = _flatten(image)
+            file = BytesIO()
+            image.save(file, 'JPEG', quality=quality, optimize=True,
+                       progressive=True, icc_profile=icc_profile)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as exc:
+        raise ServiceException(NOT_AN_IMAGE, 400) from exc
+    file.seek(0)
+    return file
+
+
+def _flatten(image):
+    if image.mode in ('RGBA', 'LA') or \
+            (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
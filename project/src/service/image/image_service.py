@@ -13,12 +13,35 @@ class ImageService(ABC):
     @abstractmethod
     def upload_image(self, file, share_id):
         """
-        Upload an image related to a share.
+        Upload an image related to a share. The upload may be finished
+        in the background, the share's 'image_status' follows its progress.
         Args:
             file (file object): The image file to be uploaded.
             share_id (int): ID of the share to which the image corresponds.
         """
 
+    @abstractmethod
+    def create_upload_url(self, share_id):
+        """
+        Create a short-lived URL, so a client can upload the image of a share
+        straight to the storage. The upload has to be confirmed afterwards.
+        Args:
+            share_id (int): ID of the share to which the image corresponds.
+        Returns:
+            dict: 'url' to POST the image to, and form 'fields' to send with it.
+        """
+
+    @abstractmethod
+    def confirm_upload(self, share_id):
+        """
+        Confirm that a client has uploaded the image of a share through an upload URL,
+        and start normalizing and distributing the image.
+        Args:
+            share_id (int): ID of the share to which the image corresponds.
+        Raises:
+            ServiceException: If the image hasn't been uploaded or isn't an image.
+        """
+
     @abstractmethod
     def get_image(self, share):
         """
@@ -30,11 +53,24 @@ class ImageService(ABC):
         """
 
     @abstractmethod
-    def delete_space_directory(self, space):
+    def get_image_variants(self, share):
+        """
+        Retrieve the size variants of the image related to a specific share.
+        Args:
+            share (Share): The Share object for which to retrieve the variants.
+        Returns:
+            dict: Image items by variant name, including 'original',
+            None if the image isn't ready.
+        """
+
+    @abstractmethod
+    def delete_space_directory(self, space, progress=None):
         """
         Delete the directory associated with a space, including all its contents.
+        Runs in the background, so it doesn't rely on the request's JWT.
         Args:
             space (Space): The Space object for which to delete the directory.
+            progress (callable, optional): Called with the number of files deleted so far.
         """
 
     @abstractmethod
@@ -50,5 +86,6 @@ class ImageService(ABC):
     @abstractmethod
     def create_temp_directory(self):
         """
-        Create a temporary directory for file upload.
+        Create a temporary directory for file upload and resume
+        the uploads left unfinished by a previous run.
         """
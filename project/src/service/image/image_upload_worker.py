@@ -0,0 +1,113 @@
+"""
+Module containing the ImageUploadWorker class.
+"""
+import os
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ...exception.service.service_exception import ServiceException
+
+logger = logging.getLogger(__name__)
+
+
+class ImageUploadWorker():
+    """
+    This class uploads images in the background, so a request doesn't wait for them.
+    An image is first written to a local spool directory and then passed to the
+    upload function by a thread pool, which retries it on failure.
+    Every spooled file gets a unique name ('<object_key>#<id>'), so uploads of the
+    same key don't overwrite each other. It is claimed by renaming it to
+    '<object_key>#<new id>#<pid>', so files left behind by a stopped process can be
+    resumed at startup without being uploaded twice.
+    An image rejected by the upload function with a ServiceException won't
+    upload on another attempt either, so it is dropped instead of retried.
+    """
+
+    PART_SUFFIX = '.part'
+    RETRY_DELAY = 0.5
+
+    def __init__(self, spool_dir, max_workers, retries, upload, on_finished):
+        """
+        Args:
+            spool_dir (str): Directory for the images waiting to be uploaded.
+            max_workers (int): Number of upload threads.
+            retries (int): Number of attempts of a single upload.
+            upload (callable): Uploads a file, called with its path and object key.
+            on_finished (callable): Called with the object key, whether
+                the upload succeeded and the value returned by the upload.
+        """
+        self.spool_dir = spool_dir
+        self.retries = retries
+        self.upload = upload
+        self.on_finished = on_finished
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='image-upload')
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def submit(self, file, object_key):
+        """
+        Spool an image and schedule its upload.
+        Args:
+            file (file object): The image file to be uploaded.
+            object_key (str): Key under which the image is uploaded.
+        """
+        spooled_name = f'{object_key}#{uuid.uuid4().hex}'
+        path = os.path.join(self.spool_dir, spooled_name)
+        file.save(path + self.PART_SUFFIX)
+        os.replace(path + self.PART_SUFFIX, path)
+        self.executor.submit(self.__run, object_key, spooled_name)
+
+    def resume(self):
+        """
+        Schedule the uploads of images spooled by a process that has stopped.
+        """
+        for name in os.listdir(self.spool_dir):
+            if name.endswith(self.PART_SUFFIX):
+                continue
+            object_key, *suffixes = name.split('#')
+            pid = suffixes[-1] if len(suffixes) > 1 else None
+            if not pid or not self.__is_running(int(pid)):
+                self.executor.submit(self.__run, object_key, name)
+
+    def __run(self, object_key, spooled_name):
+        path = os.path.join(self.spool_dir, spooled_name)
+        claimed_path = os.path.join(
+            self.spool_dir, f'{object_key}#{uuid.uuid4().hex}#{os.getpid()}')
+        try:
+            os.replace(path, claimed_path)
+        except FileNotFoundError:
+            return
+        try:
+            succeeded, result = self.__upload_with_retries(claimed_path, object_key)
+        except ServiceException:
+            logger.exception('Upload of %s was rejected, the image is dropped', object_key)
+            succeeded, result = False, None
+            os.remove(claimed_path)
+        if succeeded:
+            os.remove(claimed_path)
+        self.on_finished(object_key, succeeded, result)
+
+    def __upload_with_retries(self, path, object_key):
+        for attempt in range(self.retries):
+            try:
+                return True, self.upload(path, object_key)
+            except ServiceException:
+                raise
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    'Upload of %s failed, attempt %s', object_key, attempt + 1)
+                time.sleep(self.RETRY_DELAY * 2 ** attempt)
+        return False, None
+
+    def __is_running(self, pid):
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
@@ -0,0 +1,58 @@
+"""
+Module containing functions to generate size variants of share images.
+"""
+from io import BytesIO
+from PIL import Image, ImageOps
+
+VARIANTS = {
+    'thumbnail': 200,
+    'medium': 800
+}
+
+
+def create_variants(source, quality):
+    """
+    Create the downscaled variants of an image as progressive JPEGs.
+    Images smaller than a variant are not upscaled.
+    Args:
+        source (str or file object): The original image.
+        quality (int): JPEG quality.
+    Returns:
+        list: (variant name, file object) tuples.
+    """
+    variants = []
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        for name, size in VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((size, size))
+            file = BytesIO()
+            variant.save(file, 'JPEG', quality=quality,
+                         optimize=True, progressive=True)
+            file.seek(0)
+            variants.append((name, file))
+    return variants
+
+
+def get_variant_key(key, name):
+    """
+    Get the key of an image variant, e.g. '7_thumbnail.jpg' for '7.jpg'.
+    Args:
+        key (str): Key of the original image.
+        name (str): Name of the variant.
+    Returns:
+        str: The key of the variant.
+    """
+    stem, dot, extension = key.rpartition('.')
+    return f'{stem}_{name}{dot}{extension}'
+
+
+def is_variant_key(key):
+    """
+    Check if a key belongs to an image variant rather than to an original image.
+    Args:
+        key (str): Key of the image.
+    Returns:
+        bool: True if the key is a variant's key.
+    """
+    return '_' in key
@@ -0,0 +1,76 @@
+"""
+Module containing the LocalImageDistributor class.
+"""
+import os
+import logging
+from concurrent.futures import Future
+from queue import Queue
+from threading import Thread
+
+from ..image.image_distributor import ImageDistributor
+from ..image.image_variants import is_variant_key
+from ...repository.repository import Repository
+from ...model.share import Share
+
+logger = logging.getLogger(__name__)
+
+
+class LocalImageDistributor(ImageDistributor):
+    """
+    Concrete implementation of the ImageDistributor abstract class standing in for
+    the SQS queue and the distributor Lambda on the local filesystem, so the whole
+    upload flow runs on a single machine, e.g. for benchmarks and CI.
+    Images are moved from the temporary directory under LOCAL_IMAGE_ROOT to the
+    directory of their space by a pool of DISTRIBUTOR_WORKERS threads. Every share
+    is handled by the same thread, which keeps the order of its images like the
+    FIFO queue does. Once an original is in place, its share is marked as ready,
+    as the Lambda does through the image-ready endpoint.
+    Queued images are kept in memory only, they aren't resumed after a restart.
+    """
+
+    TEMP_DIRECTORY = 'temp'
+
+    def __init__(self, app, repository: Repository):
+        self.root = os.path.abspath(app.config['LOCAL_IMAGE_ROOT'])
+        self.directory_prefix = 'test-space-id-' if app.config['MODE'] == 'test' \
+            else 'space-id-'
+        self.repository = repository
+        self.queues = []
+        for index in range(app.config['DISTRIBUTOR_WORKERS']):
+            queue = Queue()
+            Thread(target=self.__run, args=(queue,),
+                   name=f'image-distributor-{index}', daemon=True).start()
+            self.queues.append(queue)
+
+    def distribute(self, object_key):
+        share_key = object_key.split('.')[0].split('_')[0]
+        self.queues[hash(share_key) % len(self.queues)].put(object_key)
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def __run(self, queue):
+        while True:
+            object_key = queue.get()
+            try:
+                self.__move_image(object_key)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Distribution of %s failed', object_key)
+
+    def __move_image(self, object_key):
+        space_id, share_file_name = object_key.split('-', 1)
+        directory = os.path.join(self.root, self.directory_prefix + space_id)
+        os.makedirs(directory, exist_ok=True)
+        os.replace(os.path.join(self.root, self.TEMP_DIRECTORY, object_key),
+                   os.path.join(directory, share_file_name))
+        if not is_variant_key(share_file_name):
+            self.__mark_image_ready(int(share_file_name.split('.')[0]))
+
+    def __mark_image_ready(self, share_id):
+        try:
+            share = self.repository.get_by_id(Share, share_id)
+            if share and share.image_status == Share.IMAGE_PENDING:
+                share.image_status = Share.IMAGE_READY
+                self.repository.add(share)
+        finally:
+            self.repository.remove_session()
@@ -0,0 +1,270 @@
+"""
+Module containing the LocalImageService class.
+"""
+import os
+import shutil
+from flask import url_for
+from flask_jwt_extended import jwt_required
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+
+from ..image.image_service import ImageService
+from ..image.image_distributor import ImageDistributor
+from ..image.image_upload_worker import ImageUploadWorker
+from ..image.image_normalizer import validate_image, normalize_image
+from ..image.image_variants import (
+    VARIANTS, create_variants, get_variant_key, is_variant_key
+)
+from ..helper.service_validator import ServiceValidator
+from ...exception.service.service_exception import ServiceException
+from ...exception.service.forbidden_exception import ForbiddenException
+from ...repository.repository import Repository
+from ...model.share import Share
+
+
+class LocalImageService(ImageService):
+    """
+    Concrete implementation of the ImageService abstract class using the local filesystem,
+    for single-node deployments and benchmarks.
+    Images are stored under a root directory with the same layout as the S3 buckets:
+    a directory per space holding <share_id>.jpg files with their downscaled
+    <share_id>_<variant>.jpg variants, and a temporary directory for uploads.
+    Images are normalized into the temporary directory, and an ImageDistributor
+    moves them into place, like the SQS queue and Lambda do for S3.
+    Files are written under a temporary name and renamed, so a reader
+    never sees a partial image.
+    Images are served by the local image controller through signed, expiring URLs.
+    """
+
+    FILE_FORMAT = '.jpg'
+    TEMP_DIRECTORY = 'temp'
+    PART_SUFFIX = '.part'
+
+    def __init__(self, app, repository: Repository, validator: ServiceValidator,
+                 distributor: ImageDistributor):
+        self.root = os.path.abspath(app.config['LOCAL_IMAGE_ROOT'])
+        self.mode = app.config['MODE']
+        self.url_expires_in = app.config['MEDIA_URL_EXPIRES_IN']
+        self.upload_url_expires_in = app.config['UPLOAD_URL_EXPIRES_IN']
+        self.upload_max_size = app.config['UPLOAD_MAX_SIZE']
+        self.image_max_dimension = app.config['IMAGE_MAX_DIMENSION']
+        self.image_quality = app.config['IMAGE_QUALITY']
+        self.image_serializer = URLSafeTimedSerializer(
+            app.config['SECRET_KEY'], salt='local-image')
+        self.upload_serializer = URLSafeTimedSerializer(
+            app.config['SECRET_KEY'], salt='local-image-upload')
+        self.upload_worker = ImageUploadWorker(
+            app.config['UPLOAD_SPOOL_DIR'],
+            app.config['UPLOAD_WORKERS'],
+            app.config['UPLOAD_RETRIES'],
+            self.__upload_spooled_image,
+            self.__on_upload_finished
+        )
+        self.repository = repository
+        self.validator = validator
+        self.distributor = distributor
+
+    @jwt_required()
+    def upload_image(self, file, share_id):
+        share = self.__validate_owned_share(share_id)
+        validate_image(file)
+        share.image_status = Share.IMAGE_UPLOADING
+        share.image_variants = None
+        share.image_size = None
+        self.repository.add(share)
+        self.upload_worker.submit(file, self.__get_temp_object_key(share))
+
+    @jwt_required()
+    def create_upload_url(self, share_id):
+        share = self.__validate_owned_share(share_id)
+        token = self.upload_serializer.dumps(self.__get_temp_object_key(share))
+        share.image_status = Share.IMAGE_UPLOADING
+        self.repository.add(share)
+        return {
+            'url': url_for('local_image_controller.post_local_image',
+                           token=token, _external=True),
+            'fields': {}
+        }
+
+    @jwt_required()
+    def confirm_upload(self, share_id):
+        share = self.__validate_owned_share(share_id)
+        object_key = self.__get_temp_object_key(share)
+        temp_path = os.path.join(self.root, self.TEMP_DIRECTORY, object_key)
+        if not os.path.isfile(temp_path):
+            raise ServiceException("Image hasn't been uploaded", 400)
+        try:
+            keys, size = self.__stage_image(temp_path, object_key)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        share.image_status = Share.IMAGE_PENDING
+        share.image_variants = ','.join(VARIANTS)
+        share.image_size = size
+        self.repository.add(share)
+        self.__distribute(keys)
+
+    def save_upload(self, token, file):
+        """
+        Save an image uploaded by a client through an upload URL
+        to the temporary directory.
+        Args:
+            token (str): Signed token from the upload URL.
+            file (file object): The uploaded image file.
+        """
+        object_key = self.__load_token(
+            self.upload_serializer, token, self.upload_url_expires_in)
+        path = os.path.join(self.root, self.TEMP_DIRECTORY, object_key)
+        file.save(path + self.PART_SUFFIX)
+        if os.path.getsize(path + self.PART_SUFFIX) > self.upload_max_size:
+            os.remove(path + self.PART_SUFFIX)
+            raise ServiceException("Image is too large", 413)
+        os.replace(path + self.PART_SUFFIX, path)
+
+    def get_image_path(self, token):
+        """
+        Resolve a signed image URL token to the path of the image file.
+        Args:
+            token (str): Signed token from the image URL.
+        Returns:
+            str: Absolute path of the image file.
+        """
+        path = os.path.join(self.root, self.__load_token(
+            self.image_serializer, token, self.url_expires_in))
+        if not os.path.isfile(path):
+            raise ServiceException('No such image', 404)
+        return path
+
+    @jwt_required()
+    def get_image(self, share):
+        if share.image_status not in (Share.IMAGE_PENDING, Share.IMAGE_READY):
+            return None
+        directory = self.__get_space_directory(share.space_id)
+        file_name = str(share.id) + self.FILE_FORMAT
+        if not os.path.isfile(os.path.join(directory, file_name)):
+            if share.is_backfilled():
+                share.image_status = Share.IMAGE_NONE
+                self.repository.add(share)
+            return None
+        if share.image_status == Share.IMAGE_PENDING:
+            share.image_status = Share.IMAGE_READY
+            self.repository.add(share)
+        return self.__get_url(directory, file_name)
+
+    @jwt_required()
+    def get_image_variants(self, share):
+        if share.image_status != Share.IMAGE_READY:
+            return None
+        directory = self.__get_space_directory(share.space_id)
+        file_name = str(share.id) + self.FILE_FORMAT
+        if not os.path.isfile(os.path.join(directory, file_name)):
+            return None
+        urls = {'original': self.__get_url(directory, file_name)}
+        for name in (share.image_variants or '').split(','):
+            if name:
+                urls[name] = self.__get_url(
+                    directory, get_variant_key(file_name, name))
+        return urls
+
+    def delete_space_directory(self, space, progress=None):
+        directory = self.__get_space_directory(space.id)
+        if not os.path.isdir(directory):
+            return
+        count = len(os.listdir(directory))
+        shutil.rmtree(directory, ignore_errors=True)
+        if progress:
+            progress(count)
+
+    @jwt_required()
+    def get_all_images(self, space_id):
+        space, _ = self.validator.validate_membership(space_id)
+
+        directory = self.__get_space_directory(space.id)
+        if not os.path.isdir(directory):
+            return []
+        return [self.__get_url(directory, file_name)
+                for file_name in sorted(os.listdir(directory))
+                if file_name.endswith(self.FILE_FORMAT) and not is_variant_key(file_name)]
+
+    def create_temp_directory(self):
+        os.makedirs(os.path.join(self.root, self.TEMP_DIRECTORY), exist_ok=True)
+        self.upload_worker.resume()
+
+    def __validate_owned_share(self, share_id):
+        share = self.validator.validate_share(share_id)
+        self.validator.validate_share_owner(
+            share,
+            int(self.validator.get_logged_in_user_id())
+        )
+        return share
+
+    def __get_temp_object_key(self, share):
+        return str(share.space.id) + '-' + str(share.id) + self.FILE_FORMAT
+
+    def __get_space_directory(self, space_id):
+        return os.path.join(self.root, self.__get_directory_prefix() + str(space_id))
+
+    def __get_directory_prefix(self):
+        if self.mode == 'test':
+            return 'test-space-id-'
+        return 'space-id-'
+
+    def __get_url(self, directory, file_name):
+        token = self.image_serializer.dumps(
+            os.path.relpath(os.path.join(directory, file_name), self.root))
+        return url_for('local_image_controller.get_local_image',
+                       token=token, _external=True)
+
+    def __load_token(self, serializer, token, max_age):
+        try:
+            return serializer.loads(token, max_age=max_age)
+        except SignatureExpired as exc:
+            raise ForbiddenException('Link has expired') from exc
+        except BadSignature as exc:
+            raise ForbiddenException('Invalid link') from exc
+
+    def __upload_spooled_image(self, path, object_key):
+        keys, size = self.__stage_image(path, object_key)
+        # The share is pending before the distributor can mark it as ready.
+        share = self.repository.get_by_id(Share, self.__get_share_id(object_key))
+        if share:
+            share.image_variants = ','.join(VARIANTS)
+            share.image_size = size
+            if share.image_status in (Share.IMAGE_UPLOADING, Share.IMAGE_FAILED):
+                share.image_status = Share.IMAGE_PENDING
+            self.repository.add(share)
+        self.__distribute(keys)
+        return size
+
+    def __stage_image(self, path, object_key):
+        directory = os.path.join(self.root, self.TEMP_DIRECTORY)
+        image = normalize_image(path, self.image_max_dimension, self.image_quality)
+        # The original goes last, so once it's distributed the variants are too.
+        keys = []
+        for name, file in create_variants(image, self.image_quality):
+            keys.append(get_variant_key(object_key, name))
+            self.__write_file(file, os.path.join(directory, keys[-1]))
+        image.seek(0)
+        self.__write_file(image, os.path.join(directory, object_key))
+        keys.append(object_key)
+        return keys, image.getbuffer().nbytes
+
+    def __distribute(self, keys):
+        for future in [self.distributor.distribute(key) for key in keys]:
+            future.result()
+
+    def __write_file(self, file, destination):
+        with open(destination + self.PART_SUFFIX, 'wb') as destination_file:
+            shutil.copyfileobj(file, destination_file)
+        os.replace(destination + self.PART_SUFFIX, destination)
+
+    def __on_upload_finished(self, object_key, succeeded, size):
+        try:
+            share = self.repository.get_by_id(Share, self.__get_share_id(object_key))
+            if not succeeded and share and share.image_status == Share.IMAGE_UPLOADING:
+                share.image_status = Share.IMAGE_FAILED
+                self.repository.add(share)
+        finally:
+            self.repository.remove_session()
+
+    def __get_share_id(self, object_key):
+        return int(object_key[:-len(self.FILE_FORMAT)].split('-')[1])
@@ -0,0 +1,58 @@
+"""
+Module containing the PresignedUrlCache class.
+"""
+import time
+
+
+class PresignedUrlCache():
+    """
+    This class reuses presigned S3 URLs until shortly before they expire, so
+    an image keeps a stable URL that browser and CDN caches can hit, and the URL
+    doesn't have to be signed again on every request.
+    URLs are kept per object key, since keys (share IDs) are unique across buckets.
+    """
+
+    def __init__(self, s3_client, expires_in, renew_before, max_size=10000):
+        self.s3_client = s3_client
+        self.expires_in = expires_in
+        self.renew_before = renew_before
+        self.max_size = max_size
+        self.urls = {}
+
+    def get_url(self, bucket, key):
+        """
+        Get a presigned URL of an object, signing a new one only if the cached
+        one is missing or about to expire.
+        Args:
+            bucket (str): Name of the bucket.
+            key (str): Key of the object.
+        Returns:
+            str: The presigned URL.
+        """
+        now = time.monotonic()
+        cached = self.urls.get(key)
+        if cached and cached[0] == bucket and cached[2] - now > self.renew_before:
+            return cached[1]
+        url = self.s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket, 'Key': key},
+            ExpiresIn=self.expires_in
+        )
+        if len(self.urls) >= self.max_size:
+            self.__drop_expiring(now)
+        self.urls[key] = (bucket, url, now + self.expires_in)
+        return url
+
+    def invalidate(self, key):
+        """
+        Forget the URL of an object, e.g. after the object has been replaced or deleted.
+        Args:
+            key (str): Key of the object.
+        """
+        self.urls.pop(key, None)
+
+    def __drop_expiring(self, now):
+        self.urls = {key: cached for key, cached in list(self.urls.items())
+                     if cached[2] - now > self.renew_before}
+        if len(self.urls) >= self.max_size:
+            self.urls = {}
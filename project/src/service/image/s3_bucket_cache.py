@@ -0,0 +1,89 @@
+"""
+Module containing the S3BucketCache class.
+"""
+import time
+from threading import Lock
+
+
+class S3BucketCache():
+    """
+    This class maps space IDs to the names of their S3 buckets, so a bucket
+    doesn't have to be found by listing every bucket in the account on each lookup.
+    Bucket names are given as <prefix><space_id>-<random suffix>.
+    The mapping is loaded with a single list_buckets call. It is reloaded
+    on a miss if it's older than the TTL, or if a bucket is expected for the space
+    because an image has just been uploaded to it.
+    """
+
+    def __init__(self, s3_client, prefix, ttl):
+        self.s3_client = s3_client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.buckets = {}
+        self.expected = set()
+        self.loaded_at = None
+        self.lock = Lock()
+
+    def get(self, space_id):
+        """
+        Find the bucket of a space.
+        Args:
+            space_id (int): ID of the target space.
+        Returns:
+            str: The bucket name, None if the space has no bucket.
+        """
+        bucket = self.buckets.get(space_id)
+        if bucket is None and (self.__is_stale() or space_id in self.expected):
+            self.__load()
+            bucket = self.buckets.get(space_id)
+        if bucket is not None:
+            self.expected.discard(space_id)
+        return bucket
+
+    def get_all(self):
+        """
+        Get the buckets of all spaces, reloaded from S3.
+        Returns:
+            dict: Bucket names by space ID.
+        """
+        self.__load()
+        return dict(self.buckets)
+
+    def expect(self, space_id):
+        """
+        Mark that a bucket is about to be created for a space.
+        Args:
+            space_id (int): ID of the target space.
+        """
+        self.expected.add(space_id)
+
+    def invalidate(self, space_id):
+        """
+        Forget the bucket of a space, e.g. after the bucket has been deleted.
+        Args:
+            space_id (int): ID of the target space.
+        """
+        self.buckets.pop(space_id, None)
+        self.expected.discard(space_id)
+
+    def __load(self):
+        with self.lock:
+            buckets = {}
+            for bucket in self.s3_client.list_buckets()['Buckets']:
+                space_id = self.__get_space_id(bucket['Name'])
+                if space_id is not None:
+                    buckets[space_id] = bucket['Name']
+            self.buckets = buckets
+            self.loaded_at = time.monotonic()
+
+    def __get_space_id(self, bucket_name):
+        if not bucket_name.startswith(self.prefix):
+            return None
+        space_id = bucket_name[len(self.prefix):].split('-')[0]
+        if not space_id.isdigit():
+            return None
+        return int(space_id)
+
+    def __is_stale(self):
+        return self.loaded_at is None or \
+            time.monotonic() - self.loaded_at >= self.ttl
@@ -0,0 +1,125 @@
+"""
+Module containing the S3SpaceLayout ABC (Abstract Base Class) and its implementations.
+"""
+from abc import ABC, abstractmethod
+
+from ..image.s3_bucket_cache import S3BucketCache
+
+
+class S3SpaceLayout(ABC):
+    """
+    Abstract base class for the ways of placing the images of spaces in S3.
+    A space's images are found under a key prefix in a bucket.
+    """
+
+    @abstractmethod
+    def locate(self, space_id):
+        """
+        Find where the images of a space are stored.
+        Args:
+            space_id (int): ID of the target space.
+        Returns:
+            tuple: (bucket name, key prefix), None if the space has no storage yet.
+        """
+
+    @abstractmethod
+    def get_key_prefix(self, space_id):
+        """
+        Get the prefix of the keys of a space's images.
+        Args:
+            space_id (int): ID of the target space.
+        Returns:
+            str: The key prefix.
+        """
+
+    @abstractmethod
+    def expect(self, space_id):
+        """
+        Mark that images are about to be distributed to a space.
+        Args:
+            space_id (int): ID of the target space.
+        """
+
+    @abstractmethod
+    def remove(self, space_id):
+        """
+        Remove the storage of a space whose images have all been deleted.
+        Args:
+            space_id (int): ID of the target space.
+        """
+
+    @abstractmethod
+    def create(self):
+        """
+        Create the storage shared by all spaces, if the layout has one.
+        """
+
+
+class S3BucketLayout(S3SpaceLayout):
+    """
+    Every space has its own bucket, named <prefix><space_id>-<random suffix>
+    and found through an S3BucketCache. Keys are the share file names.
+    """
+
+    def __init__(self, s3_client, bucket_prefix, ttl):
+        self.s3_client = s3_client
+        self.bucket_cache = S3BucketCache(s3_client, bucket_prefix, ttl)
+
+    def locate(self, space_id):
+        bucket = self.bucket_cache.get(int(space_id))
+        if not bucket:
+            return None
+        return bucket, self.get_key_prefix(space_id)
+
+    def get_key_prefix(self, space_id):
+        return ''
+
+    def expect(self, space_id):
+        self.bucket_cache.expect(int(space_id))
+
+    def remove(self, space_id):
+        location = self.locate(space_id)
+        if location:
+            self.s3_client.delete_bucket(Bucket=location[0])
+        self.bucket_cache.invalidate(int(space_id))
+
+    def create(self):
+        pass
+
+    def get_all(self):
+        """
+        Get the buckets of all spaces.
+        Returns:
+            dict: Bucket names by space ID.
+        """
+        return self.bucket_cache.get_all()
+
+
+class S3PrefixLayout(S3SpaceLayout):
+    """
+    All spaces share one bucket, the images of a space are kept under
+    the <prefix><space_id>/ key prefix. Finding a space takes no request to S3,
+    and the bucket count doesn't grow with the spaces.
+    """
+
+    def __init__(self, s3_client, bucket, key_prefix):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key_prefix = key_prefix
+
+    def locate(self, space_id):
+        return self.bucket, self.get_key_prefix(space_id)
+
+    def get_key_prefix(self, space_id):
+        return f'{self.key_prefix}{space_id}/'
+
+    def expect(self, space_id):
+        pass
+
+    def remove(self, space_id):
+        pass
+
+    def create(self):
+        buckets = self.s3_client.list_buckets()['Buckets']
+        if not any(bucket['Name'] == self.bucket for bucket in buckets):
+            self.s3_client.create_bucket(Bucket=self.bucket)
@@ -0,0 +1,78 @@
+"""
+Module containing the SqsBatchSender class.
+"""
+import uuid
+from concurrent.futures import Future
+from threading import Condition, Thread
+
+
+class SqsBatchSender():
+    """
+    This class buffers messages for a FIFO SQS queue and sends them with
+    send_message_batch, up to 10 messages per call. A message waits at most
+    the flush interval for others to join its batch, so bursts of uploads
+    need a fraction of the requests.
+    Messages are sent by a single thread in the order they were queued,
+    which keeps the FIFO order of the message group.
+    """
+
+    MAX_BATCH_SIZE = 10
+
+    def __init__(self, sqs_client, queue_url, group_id, flush_interval):
+        self.sqs_client = sqs_client
+        self.queue_url = queue_url
+        self.group_id = group_id
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.condition = Condition()
+        Thread(target=self.__run, name='sqs-batch-sender', daemon=True).start()
+
+    def send(self, body):
+        """
+        Queue a message to be sent with the next batch.
+        Args:
+            body (str): Body of the message.
+        Returns:
+            Future: Resolved with the message ID once the message is sent,
+            or with the exception if sending failed.
+        """
+        future = Future()
+        with self.condition:
+            self.pending.append((body, future))
+            self.condition.notify()
+        return future
+
+    def __run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                if len(self.pending) < self.MAX_BATCH_SIZE:
+                    self.condition.wait_for(
+                        lambda: len(self.pending) >= self.MAX_BATCH_SIZE,
+                        timeout=self.flush_interval)
+                batch = self.pending[:self.MAX_BATCH_SIZE]
+                del self.pending[:self.MAX_BATCH_SIZE]
+            self.__send_batch(batch)
+
+    def __send_batch(self, batch):
+        entries = [{
+            'Id': str(index),
+            'MessageBody': body,
+            'MessageGroupId': self.group_id,
+            'MessageDeduplicationId': uuid.uuid4().hex
+        } for index, (body, _) in enumerate(batch)]
+        try:
+            response = self.sqs_client.send_message_batch(
+                QueueUrl=self.queue_url, Entries=entries)
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for result in response.get('Successful', []):
+            batch[int(result['Id'])][1].set_result(result['MessageId'])
+        for result in response.get('Failed', []):
+            batch[int(result['Id'])][1].set_exception(
+                RuntimeError(f"{result['Code']}: {result.get('Message', '')}"))
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError('Message was not sent'))
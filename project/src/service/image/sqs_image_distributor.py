@@ -0,0 +1,36 @@
+"""
+Module containing the SqsImageDistributor class.
+"""
+import boto3
+import botocore.config
+
+from ..image.image_distributor import ImageDistributor
+from ..image.sqs_batch_sender import SqsBatchSender
+
+
+class SqsImageDistributor(ImageDistributor):
+    """
+    Concrete implementation of the ImageDistributor abstract class handing images
+    over to the distributor Lambda through the SQS FIFO queue.
+    Keys are sent in batches by an SqsBatchSender, in the MODE message group.
+    """
+
+    def __init__(self, app):
+        sqs_client = boto3.client(
+            'sqs',
+            region_name='us-east-1',
+            config=botocore.config.Config(
+                max_pool_connections=app.config['AWS_MAX_POOL_CONNECTIONS'],
+                retries={'max_attempts': app.config['AWS_MAX_ATTEMPTS'],
+                         'mode': 'standard'}
+            )
+        )
+        self.sender = SqsBatchSender(
+            sqs_client,
+            app.config['SQS_URL'],
+            app.config['MODE'],
+            app.config['SQS_FLUSH_INTERVAL']
+        )
+
+    def distribute(self, object_key):
+        return self.sender.send(object_key)
@@ -0,0 +1,155 @@
+import os
+import importlib.util
+from unittest import TestCase, mock
+from botocore.exceptions import ClientError
+
+LAMBDA_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'aws', 'src', 'lambda',
+    'shared-spaces-distributor.py')
+TEMP_BUCKET = 'shared-spaces-temp'
+
+
+def load_distributor():
+    spec = importlib.util.spec_from_file_location('shared_spaces_distributor', LAMBDA_PATH)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-east-1'}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'operation')
+
+
+class FakeS3():
+
+    def __init__(self, buckets=()):
+        self.objects = {bucket: {} for bucket in buckets}
+        self.objects.setdefault(TEMP_BUCKET, {})
+        self.failing_keys = set()
+        self.list_buckets_calls = 0
+
+    def list_buckets(self):
+        self.list_buckets_calls += 1
+        return {'Buckets': [{'Name': name} for name in self.objects]}
+
+    def create_bucket(self, Bucket):
+        if Bucket in self.objects:
+            raise client_error('BucketAlreadyExists')
+        self.objects[Bucket] = {}
+
+    def copy_object(self, CopySource, Bucket, Key):
+        if CopySource['Key'] in self.failing_keys:
+            raise client_error('InternalError')
+        temp = self.objects[CopySource['Bucket']]
+        if CopySource['Key'] not in temp:
+            raise client_error('NoSuchKey')
+        self.objects.setdefault(Bucket, {})[Key] = temp[CopySource['Key']]
+
+    def delete_object(self, Bucket, Key):
+        self.objects[Bucket].pop(Key, None)
+
+
+class FakeSqs():
+
+    def __init__(self):
+        self.deleted = []
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.deleted.extend(entry['ReceiptHandle'] for entry in Entries)
+
+
+class TestDistributor(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_distributor()
+
+    def setUp(self):
+        self.s3 = FakeS3()
+        self.sqs = FakeSqs()
+        patcher = mock.patch.multiple(
+            self.module, s3_client=self.s3, sqs_client=self.sqs, IMAGE_READY_URL=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, *object_keys):
+        records = []
+        for object_key in object_keys:
+            self.s3.objects[TEMP_BUCKET][object_key] = b'image of ' + object_key.encode()
+            records.append({
+                'messageId': 'message-' + object_key,
+                'receiptHandle': 'handle-' + object_key,
+                'body': object_key,
+                'attributes': {'MessageGroupId': 'test'}
+            })
+        return {'Records': records}
+
+    def find_bucket(self, space_id):
+        return self.module.find_bucket(f'test-space-id-{space_id}', list(self.s3.objects))
+
+    def test_normal_run(self):
+        event = self.upload('1-1_thumbnail.jpg', '1-1.jpg', '2-2.jpg')
+        result = self.module.lambda_handler(event, None)
+        self.assertEqual(result, {'batchItemFailures': []})
+        self.assertEqual(set(self.s3.objects[self.find_bucket(1)]),
+                         {'1_thumbnail.jpg', '1.jpg'})
+        self.assertEqual(set(self.s3.objects[self.find_bucket(2)]), {'2.jpg'})
+        self.assertEqual(self.s3.objects[TEMP_BUCKET], {})
+        self.assertEqual(len(self.sqs.deleted), 3)
+
+    def test_buckets_looked_up_once(self):
+        event = self.upload('1-1.jpg', '1-2.jpg', '1-3.jpg', '2-4.jpg')
+        self.module.lambda_handler(event, None)
+        self.assertEqual(self.s3.list_buckets_calls, 1)
+        self.assertEqual(
+            len([name for name in self.s3.objects if name.startswith('test-space-id-1-')]), 1)
+
+    def test_failure_returns_later_records(self):
+        event = self.upload('1-1.jpg', '1-2.jpg', '1-3.jpg', '1-4.jpg')
+        self.s3.failing_keys.add('1-2.jpg')
+        result = self.module.lambda_handler(event, None)
+        self.assertEqual(result, {'batchItemFailures': [
+            {'itemIdentifier': 'message-1-2.jpg'},
+            {'itemIdentifier': 'message-1-3.jpg'},
+            {'itemIdentifier': 'message-1-4.jpg'}
+        ]})
+        self.assertEqual(self.sqs.deleted, ['handle-1-1.jpg'])
+
+    def test_retried_records_distributed(self):
+        event = self.upload('1-1.jpg', '1-2.jpg', '1-3.jpg')
+        self.s3.failing_keys.add('1-2.jpg')
+        result = self.module.lambda_handler(event, None)
+        failed = {failure['itemIdentifier'] for failure in result['batchItemFailures']}
+
+        self.s3.failing_keys.clear()
+        retry = {'Records': [record for record in event['Records']
+                             if record['messageId'] in failed]}
+        result = self.module.lambda_handler(retry, None)
+        self.assertEqual(result, {'batchItemFailures': []})
+        self.assertEqual(set(self.s3.objects[self.find_bucket(1)]), {'1.jpg', '2.jpg', '3.jpg'})
+        self.assertEqual(len(self.sqs.deleted), 3)
+
+    def test_missing_temp_object(self):
+        event = self.upload('1-1.jpg')
+        self.s3.objects[TEMP_BUCKET].clear()
+        result = self.module.lambda_handler(event, None)
+        self.assertEqual(result, {'batchItemFailures': []})
+        self.assertEqual(self.sqs.deleted, ['handle-1-1.jpg'])
+
+    def test_notify_only_distributed_originals(self):
+        event = self.upload('1-1_thumbnail.jpg', '1-1.jpg', '1-2_thumbnail.jpg', '1-2.jpg')
+        self.s3.failing_keys.add('1-2_thumbnail.jpg')
+        with mock.patch.object(self.module, 'notify_image_ready') as notify:
+            self.module.lambda_handler(event, None)
+        self.assertEqual([call.args[0] for call in notify.call_args_list],
+                         ['1-1_thumbnail.jpg', '1-1.jpg'])
+
+    def test_prefix_layout(self):
+        event = self.upload('1-1.jpg', '2-2_medium.jpg')
+        with mock.patch.multiple(self.module, STORAGE_LAYOUT='prefix', S3_BUCKET='spaces'):
+            result = self.module.lambda_handler(event, None)
+        self.assertEqual(result, {'batchItemFailures': []})
+        self.assertEqual(set(self.s3.objects['spaces']),
+                         {'test-spaces/1/1.jpg', 'test-spaces/2/2_medium.jpg'})
+        self.assertEqual(self.s3.list_buckets_calls, 0)
@@ -0,0 +1,49 @@
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+from botocore.exceptions import ClientError
+from test.helper import FakeS3, get_aws_image_service
+
+BUCKET = 'test-space-id-1-12345'
+
+
+class TestDeleteSpaceDirectory(TestCase):
+
+    def setUp(self):
+        self.s3 = FakeS3({BUCKET: {f'{index}.jpg': b'image' for index in range(5)}})
+        spool_dir = tempfile.mkdtemp(prefix='test-upload-spool-')
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        self.service = get_aws_image_service(self.s3, spool_dir)
+        self.service.DELETE_BATCH_SIZE = 2
+        self.space = SimpleNamespace(id=1)
+
+    def count_requests(self, key):
+        return len([keys for _, keys in self.s3.delete_requests if key in keys])
+
+    def test_normal_run(self):
+        progress = []
+        self.service.delete_space_directory(self.space, progress.append)
+        self.assertEqual(sorted(progress)[-1], 5)
+        self.assertTrue(all(len(keys) <= 2 for _, keys in self.s3.delete_requests))
+        self.assertEqual(len(self.s3.delete_requests), 3)
+        self.assertNotIn(BUCKET, self.s3.buckets)
+
+    def test_failed_deletes_retried(self):
+        self.s3.failing_deletes = {'1.jpg': 1, '4.jpg': 2}
+        progress = []
+        self.service.delete_space_directory(self.space, progress.append)
+        self.assertEqual(sorted(progress)[-1], 5)
+        self.assertEqual(self.count_requests('1.jpg'), 2)
+        self.assertEqual(self.count_requests('4.jpg'), 3)
+        self.assertEqual(self.count_requests('0.jpg'), 1)
+        self.assertNotIn(BUCKET, self.s3.buckets)
+
+    def test_attempts_exhausted(self):
+        self.s3.failing_deletes = {'1.jpg': self.service.DELETE_ATTEMPTS}
+        progress = []
+        with self.assertRaises(ClientError):
+            self.service.delete_space_directory(self.space, progress.append)
+        self.assertEqual(sorted(progress)[-1], 4)
+        self.assertEqual(self.count_requests('1.jpg'), self.service.DELETE_ATTEMPTS)
+        self.assertEqual(list(self.s3.buckets[BUCKET]), ['1.jpg'])
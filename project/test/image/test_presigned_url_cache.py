@@ -0,0 +1,60 @@
+from unittest import TestCase, mock
+from src.service.image.presigned_url_cache import PresignedUrlCache
+
+
+class FakeS3():
+
+    def __init__(self):
+        self.signed = []
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.signed.append((operation, Params, ExpiresIn))
+        return f"https://{Params['Bucket']}/{Params['Key']}?signature={len(self.signed)}"
+
+
+class TestPresignedUrlCache(TestCase):
+
+    def setUp(self):
+        self.s3 = FakeS3()
+        self.now = 1000.0
+        patcher = mock.patch(
+            'src.service.image.presigned_url_cache.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_url_reused(self):
+        cache = PresignedUrlCache(self.s3, 3600, 600)
+        url = cache.get_url('bucket-1', '1.jpg')
+        self.now += 2999
+        self.assertEqual(cache.get_url('bucket-1', '1.jpg'), url)
+        self.assertEqual(self.s3.signed, [
+            ('get_object', {'Bucket': 'bucket-1', 'Key': '1.jpg'}, 3600)])
+
+    def test_url_renewed_before_expiry(self):
+        cache = PresignedUrlCache(self.s3, 3600, 600)
+        url = cache.get_url('bucket-1', '1.jpg')
+        self.now += 3000
+        self.assertNotEqual(cache.get_url('bucket-1', '1.jpg'), url)
+        self.assertEqual(len(self.s3.signed), 2)
+
+    def test_other_bucket(self):
+        cache = PresignedUrlCache(self.s3, 3600, 600)
+        cache.get_url('bucket-1', '1.jpg')
+        self.assertEqual(cache.get_url('bucket-2', '1.jpg'),
+                         'https://bucket-2/1.jpg?signature=2')
+
+    def test_invalidate(self):
+        cache = PresignedUrlCache(self.s3, 3600, 600)
+        url = cache.get_url('bucket-1', '1.jpg')
+        cache.invalidate('1.jpg')
+        self.assertNotEqual(cache.get_url('bucket-1', '1.jpg'), url)
+
+    def test_max_size(self):
+        cache = PresignedUrlCache(self.s3, 3600, 600, max_size=2)
+        cache.get_url('bucket-1', '1.jpg')
+        self.now += 3000
+        cache.get_url('bucket-1', '2.jpg')
+        cache.get_url('bucket-1', '3.jpg')
+        self.assertEqual(set(cache.urls), {'2.jpg', '3.jpg'})
+        cache.get_url('bucket-1', '4.jpg')
+        self.assertEqual(set(cache.urls), {'4.jpg'})
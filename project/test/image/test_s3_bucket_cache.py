@@ -0,0 +1,62 @@
+from unittest import TestCase, mock
+from src.service.image.s3_bucket_cache import S3BucketCache
+
+
+class FakeS3():
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.list_calls = 0
+
+    def list_buckets(self):
+        self.list_calls += 1
+        return {'Buckets': [{'Name': name} for name in self.buckets]}
+
+
+class TestS3BucketCache(TestCase):
+
+    def setUp(self):
+        self.s3 = FakeS3(['test-space-id-1-12345', 'test-space-id-2-23456',
+                          'test-space-id-x-34567', 'shared-spaces-temp'])
+        self.now = 1000.0
+        patcher = mock.patch(
+            'src.service.image.s3_bucket_cache.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = S3BucketCache(self.s3, 'test-space-id-', 10)
+
+    def test_loaded_once(self):
+        self.assertEqual(self.cache.get(1), 'test-space-id-1-12345')
+        self.assertEqual(self.cache.get(2), 'test-space-id-2-23456')
+        self.assertIsNone(self.cache.get(3))
+        self.assertEqual(self.s3.list_calls, 1)
+
+    def test_miss_reloaded_after_ttl(self):
+        self.cache.get(1)
+        self.s3.buckets.append('test-space-id-3-45678')
+        self.assertIsNone(self.cache.get(3))
+        self.now += 10
+        self.assertEqual(self.cache.get(3), 'test-space-id-3-45678')
+        self.assertEqual(self.s3.list_calls, 2)
+
+    def test_expected_bucket(self):
+        self.cache.get(1)
+        self.cache.expect(3)
+        self.assertIsNone(self.cache.get(3))
+        self.s3.buckets.append('test-space-id-3-45678')
+        self.assertEqual(self.cache.get(3), 'test-space-id-3-45678')
+        self.assertEqual(self.cache.get(3), 'test-space-id-3-45678')
+        self.assertEqual(self.s3.list_calls, 3)
+
+    def test_invalidate(self):
+        self.cache.get(1)
+        self.s3.buckets.remove('test-space-id-1-12345')
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual(self.s3.list_calls, 1)
+
+    def test_get_all(self):
+        self.cache.get(1)
+        self.assertEqual(self.cache.get_all(), {
+            1: 'test-space-id-1-12345', 2: 'test-space-id-2-23456'})
+        self.assertEqual(self.s3.list_calls, 2)
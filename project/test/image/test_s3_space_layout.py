@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+from test.helper import FakeS3, get_aws_image_service
+from src.service.image.s3_space_layout import S3BucketLayout, S3PrefixLayout
+
+
+class TestS3SpaceLayout(TestCase):
+
+    def setUp(self):
+        self.s3 = FakeS3({
+            'test-space-id-1-12345': {'1.jpg': b'1', '1_thumbnail.jpg': b'1t', '2.jpg': b'2'},
+            'test-space-id-2-23456': {'3.jpg': b'3'},
+            'shared-spaces-temp': {'4-4.jpg': b'4'}
+        })
+        self.spool_dir = tempfile.mkdtemp(prefix='test-upload-spool-')
+        self.addCleanup(shutil.rmtree, self.spool_dir, ignore_errors=True)
+
+    def test_bucket_layout(self):
+        layout = S3BucketLayout(self.s3, 'test-space-id-', 10)
+        self.assertEqual(layout.locate(1), ('test-space-id-1-12345', ''))
+        self.assertIsNone(layout.locate(3))
+
+        self.s3.buckets['test-space-id-2-23456'].clear()
+        layout.remove(2)
+        self.assertNotIn('test-space-id-2-23456', self.s3.buckets)
+        self.assertIsNone(layout.locate(2))
+
+    def test_prefix_layout(self):
+        layout = S3PrefixLayout(self.s3, 'shared-spaces', 'test-spaces/')
+        self.assertEqual(layout.locate(3), ('shared-spaces', 'test-spaces/3/'))
+        layout.create()
+        layout.create()
+        self.assertEqual(self.s3.buckets['shared-spaces'], {})
+
+    def test_migrate_space_buckets(self):
+        service = get_aws_image_service(self.s3, self.spool_dir)
+        service.DELETE_BATCH_SIZE = 2
+        progress = []
+        self.assertEqual(service.migrate_space_buckets(progress.append), 4)
+        self.assertEqual(progress, [2, 3, 4])
+        self.assertEqual(self.s3.buckets['shared-spaces'], {
+            'test-spaces/1/1.jpg': b'1', 'test-spaces/1/1_thumbnail.jpg': b'1t',
+            'test-spaces/1/2.jpg': b'2', 'test-spaces/2/3.jpg': b'3'})
+        self.assertEqual(set(self.s3.buckets), {'shared-spaces', 'shared-spaces-temp'})
+
+    def test_migrate_again(self):
+        service = get_aws_image_service(self.s3, self.spool_dir)
+        service.migrate_space_buckets()
+        self.s3.buckets['test-space-id-1-12345'] = {'5.jpg': b'5'}
+        self.assertEqual(service.migrate_space_buckets(), 1)
+        self.assertEqual(self.s3.buckets['shared-spaces']['test-spaces/1/5.jpg'], b'5')
+        self.assertEqual(len(self.s3.buckets['shared-spaces']), 5)
+
+    def test_prefix_layout_service(self):
+        service = get_aws_image_service(self.s3, self.spool_dir, S3_LAYOUT='prefix')
+        service.migrate_space_buckets()
+        service.delete_space_directory(SimpleNamespace(id=1))
+        self.assertEqual(set(self.s3.buckets['shared-spaces']), {'test-spaces/2/3.jpg'})
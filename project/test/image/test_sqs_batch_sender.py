@@ -0,0 +1,72 @@
+from unittest import TestCase
+from src.service.image.sqs_batch_sender import SqsBatchSender
+
+QUEUE_URL = 'https://sqs.us-east-1.amazonaws.com/1/test.fifo'
+
+
+class FakeSqs():
+
+    def __init__(self, failed_bodies=(), skipped_bodies=(), error=None):
+        self.batches = []
+        self.failed_bodies = failed_bodies
+        self.skipped_bodies = skipped_bodies
+        self.error = error
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.batches.append((QueueUrl, Entries))
+        if self.error:
+            raise self.error
+        response = {'Successful': [], 'Failed': []}
+        for entry in Entries:
+            if entry['MessageBody'] in self.failed_bodies:
+                response['Failed'].append(
+                    {'Id': entry['Id'], 'Code': 'InternalError', 'Message': 'Try again'})
+            elif entry['MessageBody'] not in self.skipped_bodies:
+                response['Successful'].append(
+                    {'Id': entry['Id'], 'MessageId': 'id-' + entry['MessageBody']})
+        return response
+
+
+class TestSqsBatchSender(TestCase):
+
+    def send_all(self, sqs, bodies, flush_interval=0.05):
+        sender = SqsBatchSender(sqs, QUEUE_URL, 'test', flush_interval)
+        # Queued under the lock, so the sender sees all of them at once.
+        with sender.condition:
+            futures = [sender.send(body) for body in bodies]
+        return futures
+
+    def test_normal_run(self):
+        sqs = FakeSqs()
+        bodies = [f'1-{index}.jpg' for index in range(25)]
+        futures = self.send_all(sqs, bodies)
+        self.assertEqual([future.result(timeout=5) for future in futures],
+                         ['id-' + body for body in bodies])
+        self.assertEqual([len(entries) for _, entries in sqs.batches], [10, 10, 5])
+        entries = [entry for _, batch in sqs.batches for entry in batch]
+        self.assertEqual([entry['MessageBody'] for entry in entries], bodies)
+        self.assertTrue(all(entry['MessageGroupId'] == 'test' for entry in entries))
+        self.assertEqual(len({entry['MessageDeduplicationId'] for entry in entries}), 25)
+        self.assertTrue(all(queue_url == QUEUE_URL for queue_url, _ in sqs.batches))
+
+    def test_single_message_flushed(self):
+        sqs = FakeSqs()
+        future = self.send_all(sqs, ['1-1.jpg'], flush_interval=0.1)[0]
+        self.assertEqual(future.result(timeout=5), 'id-1-1.jpg')
+        self.assertEqual(len(sqs.batches), 1)
+
+    def test_failed_entries(self):
+        sqs = FakeSqs(failed_bodies=('1-2.jpg',), skipped_bodies=('1-3.jpg',))
+        futures = self.send_all(sqs, ['1-1.jpg', '1-2.jpg', '1-3.jpg'])
+        self.assertEqual(futures[0].result(timeout=5), 'id-1-1.jpg')
+        with self.assertRaisesRegex(RuntimeError, 'InternalError: Try again'):
+            futures[1].result(timeout=5)
+        with self.assertRaisesRegex(RuntimeError, 'Message was not sent'):
+            futures[2].result(timeout=5)
+
+    def test_request_failed(self):
+        sqs = FakeSqs(error=ConnectionError('Network is down'))
+        futures = self.send_all(sqs, ['1-1.jpg', '1-2.jpg'])
+        for future in futures:
+            with self.assertRaises(ConnectionError):
+                future.result(timeout=5)
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from unittest import TestCase, mock
+from test.helper import FakeS3, get_aws_image_service, read_resource
+
+TEMP_BUCKET = 'shared-spaces-temp'
+OBJECT_KEY = '1-2.jpg'
+
+
+class DistributionFuture(Future):
+    """
+    Future of a distribution, recording when it is waited on.
+    """
+
+    def __init__(self, events, object_key):
+        super().__init__()
+        self.events = events
+        self.object_key = object_key
+
+    def result(self, timeout=None):
+        self.events.append(('waited', self.object_key))
+        return super().result(timeout)
+
+
+class TestUploadSpooledImage(TestCase):
+
+    def setUp(self):
+        self.s3 = FakeS3()
+        spool_dir = tempfile.mkdtemp(prefix='test-upload-spool-')
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        self.service = get_aws_image_service(self.s3, spool_dir)
+        self.service.distributor = mock.Mock(distribute=self.distribute)
+        self.events = []
+        self.failing_keys = set()
+        self.path = os.path.join(spool_dir, OBJECT_KEY)
+        with open(self.path, 'wb') as image_file:
+            image_file.write(read_resource('test-image-1.jpg'))
+
+    def distribute(self, object_key):
+        self.events.append(('sent', object_key))
+        future = DistributionFuture(self.events, object_key)
+        if object_key in self.failing_keys:
+            future.set_exception(RuntimeError(object_key))
+        else:
+            future.set_result(None)
+        return future
+
+    def upload(self):
+        return self.service.upload_worker.upload(self.path, OBJECT_KEY)
+
+    def test_original_sent_after_variants(self):
+        size = self.upload()
+        self.assertEqual(self.events, [
+            ('sent', '1-2_thumbnail.jpg'),
+            ('sent', '1-2_medium.jpg'),
+            ('waited', '1-2_thumbnail.jpg'),
+            ('waited', '1-2_medium.jpg'),
+            ('sent', OBJECT_KEY),
+            ('waited', OBJECT_KEY)
+        ])
+        self.assertEqual(size, len(self.s3.buckets[TEMP_BUCKET][OBJECT_KEY]))
+
+    def test_original_not_sent_if_variant_failed(self):
+        self.failing_keys = {'1-2_medium.jpg'}
+        with self.assertRaises(RuntimeError):
+            self.upload()
+        self.assertNotIn(('sent', OBJECT_KEY), self.events)
+        self.assertNotIn(OBJECT_KEY, self.s3.buckets[TEMP_BUCKET])
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+from unittest import TestCase
+from werkzeug.datastructures import FileStorage
+from src.exception.service.service_exception import ServiceException
+from src.service.image.image_upload_worker import ImageUploadWorker
+
+
+class TestImageUploadWorker(TestCase):
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp(prefix='test-upload-spool-')
+        self.addCleanup(shutil.rmtree, self.spool_dir, ignore_errors=True)
+        self.uploaded = []
+        self.finished = []
+        self.lock = threading.Lock()
+
+    def create_worker(self, upload=None):
+        worker = ImageUploadWorker(
+            self.spool_dir, 2, 3, upload or self.upload, self.on_finished)
+        worker.RETRY_DELAY = 0
+        return worker
+
+    def upload(self, path, object_key):
+        with open(path, 'rb') as image_file:
+            content = image_file.read()
+        with self.lock:
+            self.uploaded.append((object_key, content))
+        return len(content)
+
+    def on_finished(self, object_key, succeeded, result):
+        with self.lock:
+            self.finished.append((object_key, succeeded, result))
+
+    def test_uploads_of_same_key(self):
+        worker = self.create_worker()
+        worker.submit(FileStorage(BytesIO(b'first')), '1-1.jpg')
+        worker.submit(FileStorage(BytesIO(b'second')), '1-1.jpg')
+        worker.executor.shutdown(wait=True)
+        self.assertEqual(sorted(self.uploaded),
+                         [('1-1.jpg', b'first'), ('1-1.jpg', b'second')])
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_rejected_image_dropped(self):
+        attempts = []
+
+        def reject(path, object_key):
+            attempts.append(object_key)
+            raise ServiceException('Not an image', 400)
+
+        worker = self.create_worker(reject)
+        worker.submit(FileStorage(BytesIO(b'not an image')), '1-1.jpg')
+        worker.executor.shutdown(wait=True)
+        self.assertEqual(attempts, ['1-1.jpg'])
+        self.assertEqual(self.finished, [('1-1.jpg', False, None)])
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_failed_upload_kept(self):
+        def fail(path, object_key):
+            raise OSError('Storage unavailable')
+
+        worker = self.create_worker(fail)
+        worker.submit(FileStorage(BytesIO(b'image')), '1-1.jpg')
+        worker.executor.shutdown(wait=True)
+        self.assertEqual(self.finished, [('1-1.jpg', False, None)])
+        self.assertEqual(len(os.listdir(self.spool_dir)), 1)
+
+    def test_resume(self):
+        files = {
+            '1-1.jpg#a1': b'unclaimed',
+            f'1-2.jpg#b2#{os.getpid()}': b'claimed by a running process',
+            '1-3.jpg#c3#999999999': b'claimed by a stopped process'
+        }
+        for name, content in files.items():
+            with open(os.path.join(self.spool_dir, name), 'wb') as spooled_file:
+                spooled_file.write(content)
+        worker = self.create_worker()
+        worker.resume()
+        worker.executor.shutdown(wait=True)
+        self.assertEqual(sorted(self.uploaded), [
+            ('1-1.jpg', b'unclaimed'), ('1-3.jpg', b'claimed by a stopped process')])
+        self.assertEqual(os.listdir(self.spool_dir), [f'1-2.jpg#b2#{os.getpid()}'])
@@ -0,0 +1,161 @@
+import json
+import time
+from io import BytesIO
+from unittest import TestCase
+from PIL import Image
+from test.helper import (
+    get_local_app, create_space_as_admin, create_share,
+    create_share_with_image, read_resource, are_image_bytes_same, wait_for_image,
+    delete_space
+)
+
+
+class TestLocalImages(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_local_app()
+        cls.client = cls.app.test_client()
+
+    def test_get_share_with_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share_with_image(
+            self.client, space_id, 'test-image-1.jpg', token)
+        response = self.client.get(
+            f'/shares/{share_id}', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual(data['image_status'], 'ready')
+
+        response = self.client.get(data['image_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(are_image_bytes_same(response.data, 'test-image-1.jpg'))
+
+        self.assertEqual(set(data['image_variants']), {'original', 'thumbnail', 'medium'})
+        response = self.client.get(data['image_variants']['thumbnail'])
+        with Image.open(BytesIO(response.data)) as thumbnail:
+            self.assertLessEqual(max(thumbnail.size), 200)
+
+    def test_get_all_images(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        create_share_with_image(
+            self.client, space_id, 'test-image-1.jpg', token)
+        create_share_with_image(
+            self.client, space_id, 'test-image-2.jpg', token)
+        response = self.client.get(
+            f'/spaces/{space_id}/images', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual(len(data), 2)
+        self.assertTrue(are_image_bytes_same(
+            self.client.get(data[0]['image_url']).data, 'test-image-1.jpg'))
+        self.assertTrue(are_image_bytes_same(
+            self.client.get(data[1]['image_url']).data, 'test-image-2.jpg'))
+
+    def test_invalid_image_url(self):
+        response = self.client.get('/local-images/invalid')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, b'Invalid link')
+
+    def test_direct_image_upload(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload', headers={"Authorization": f"Bearer {token}"})
+        upload = json.loads(response.data)
+
+        response = self.client.post(
+            upload['url'],
+            data={'file': (BytesIO(read_resource('test-image-2.jpg')), 'img')},
+            content_type='multipart/form-data'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload/confirm',
+            headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 200)
+        wait_for_image(self.client, share_id, token)
+
+        response = self.client.get(
+            f'/shares/{share_id}', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual(data['image_status'], 'ready')
+        self.assertTrue(are_image_bytes_same(
+            self.client.get(data['image_url']).data, 'test-image-2.jpg'))
+
+    def test_image_status_after_upload(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        share_ids = []
+        for img_name in ('test-image-1.jpg', 'test-image-2.jpg', 'test-image-3.jpg'):
+            _, share_id = create_share(self.client, space_id, token)
+            response = self.client.post(
+                f'/shares/{share_id}/image-upload',
+                headers={"Authorization": f"Bearer {token}"})
+            self.client.post(
+                json.loads(response.data)['url'],
+                data={'file': (BytesIO(read_resource(img_name)), 'img')},
+                content_type='multipart/form-data'
+            )
+            self.client.post(
+                f'/shares/{share_id}/image-upload/confirm',
+                headers={"Authorization": f"Bearer {token}"})
+            share_ids.append(share_id)
+        response = self.client.post(
+            f'/spaces/{space_id}/shares',
+            headers={"Authorization": f"Bearer {token}"},
+            data={'text': 'Lorem ipsum',
+                  'file': (BytesIO(read_resource('test-image-1.jpg')), 'img')},
+            content_type='multipart/form-data'
+        )
+        share_ids.append(json.loads(response.data)['id'])
+
+        for share_id in share_ids:
+            status = None
+            for _ in range(70):
+                response = self.client.get(
+                    f'/shares/{share_id}/image-status',
+                    headers={"Authorization": f"Bearer {token}"})
+                status = json.loads(response.data)['image_status']
+                if status == 'ready':
+                    break
+                time.sleep(0.1)
+            self.assertEqual(status, 'ready')
+
+    def test_delete_space_with_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share_with_image(
+            self.client, space_id, 'test-image-1.jpg', token)
+        response = self.client.get(
+            f'/shares/{share_id}', headers={"Authorization": f"Bearer {token}"})
+        image_url = json.loads(response.data)['image_url']
+
+        _, job = delete_space(self.client, space_id, token)
+        self.assertEqual(job.get('status'), 'done')
+        self.assertEqual(job.get('deleted_images'), 3)
+        response = self.client.get(image_url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_normalized_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        exif = Image.Exif()
+        exif[0x010f] = 'Camera'
+        large_image = BytesIO()
+        Image.new('RGB', (3000, 1000), (200, 10, 10)).save(
+            large_image, 'JPEG', quality=100, exif=exif)
+        large_image.seek(0)
+        self.client.put(
+            f'/shares/{share_id}',
+            data={'text': 'Lorem ipsum', 'file': (large_image, 'img')},
+            content_type='multipart/form-data',
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        wait_for_image(self.client, share_id, token)
+
+        response = self.client.get(
+            f'/shares/{share_id}', headers={"Authorization": f"Bearer {token}"})
+        content = self.client.get(json.loads(response.data)['image_url']).data
+        with Image.open(BytesIO(content)) as image:
+            self.assertEqual(image.size, (2048, 683))
+            self.assertNotIn('exif', image.info)
+        response = self.client.get(
+            f'/shares/{share_id}/image-status', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(json.loads(response.data)['image_size'], len(content))
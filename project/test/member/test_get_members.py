@@ -1,6 +1,9 @@
 import json
 from unittest import TestCase
-from test.helper import get_app, register, create_space_as_admin, add_member, register_and_login, create_space
+from test.helper import (
+    get_app, register, create_space_as_admin, add_member, register_and_login, create_space,
+    count_queries
+)
 
 
 class TestGetMembers(TestCase):
@@ -45,6 +48,19 @@ class TestGetMembers(TestCase):
         self.assertEqual(data, expected_data)
         self.assertEqual(response.status_code, 200)
 
+    def test_query_count_independent_of_size(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        headers = {"Authorization": f"Bearer {token}"}
+        _, small_count = count_queries(self.app, lambda: self.client.get(
+            f'/spaces/{space_id}/members', headers=headers))
+        for _ in range(3):
+            add_member(self.client, space_id,
+                       register(self.client).get('login'), token)
+        response, large_count = count_queries(self.app, lambda: self.client.get(
+            f'/spaces/{space_id}/members', headers=headers))
+        self.assertEqual(len(json.loads(response.data)), 4)
+        self.assertEqual(small_count, large_count)
+
     def test_space_not_exist(self):
         token, _ = register_and_login(self.client)
         response = self.client.get(
@@ -0,0 +1,34 @@
+import json
+from unittest import TestCase
+from test.helper import get_app, register_and_login
+
+
+class TestGetMetrics(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.client = cls.app.test_client()
+
+    def test_token_blocklist_size(self):
+        response = self.client.get('/metrics')
+        size = json.loads(response.data).get('token_blocklist_size')
+        token, _ = register_and_login(self.client)
+        self.client.delete(
+            '/logout', headers={"Authorization": f"Bearer {token}"})
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.data).get('token_blocklist_size'), size + 1)
+
+    def test_purge_keeps_not_expired_tokens(self):
+        token, _ = register_and_login(self.client)
+        self.client.delete(
+            '/logout', headers={"Authorization": f"Bearer {token}"})
+        result = self.app.test_cli_runner().invoke(
+            args=['purge-token-blocklist'])
+        self.assertIn('expired tokens', result.output)
+        response = self.client.get(
+            '/spaces', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data, b"You aren't authorized")
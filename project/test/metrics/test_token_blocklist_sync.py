@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest import TestCase
+from test.helper import get_app
+from src.model.tockenblocklist import TokenBlocklist
+from src.repository.sql_alchemy_repository import SqlAlchemyRepository
+from src.service.helper.token_blocklist_cache import TokenBlocklistCache
+
+TOKEN_LIFETIME = timedelta(hours=1)
+
+
+class TestTokenBlocklistSync(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.repository = SqlAlchemyRepository(cls.app.config['DATABASE_URL'])
+
+    def add_token(self, token_id):
+        token = TokenBlocklist(str(uuid.uuid4()))
+        token.id = token_id
+        self.repository.add(token)
+        return token.jti
+
+    def test_token_committed_out_of_order(self):
+        cache = TokenBlocklistCache(self.repository, 0, TOKEN_LIFETIME)
+        cache.sync()
+        last_id = cache.last_id
+        later_jti = self.add_token(last_id + 2)
+        cache.sync()
+        self.assertTrue(cache.is_revoked(later_jti))
+
+        earlier_jti = self.add_token(last_id + 1)
+        self.assertTrue(cache.is_revoked(earlier_jti))
+
+    def test_entry_without_expiry_backfilled(self):
+        # Entries added before the upgrade have no expiry.
+        jti = self.add_token(None)
+        cache = TokenBlocklistCache(self.repository, 0, TOKEN_LIFETIME)
+        before = datetime.utcnow()
+        cache.purge_expired()
+        after = datetime.utcnow()
+        token = self.repository.get_first_by_filter(TokenBlocklist, TokenBlocklist.jti == jti)
+        self.assertIsNotNone(token)
+        self.assertGreaterEqual(token.expires_at, before + TOKEN_LIFETIME)
+        self.assertLessEqual(token.expires_at, after + TOKEN_LIFETIME)
+
+    def test_entry_without_expiry_purged_after_token_lifetime(self):
+        jti = self.add_token(None)
+        cache = TokenBlocklistCache(self.repository, 0, timedelta(seconds=-1))
+        cache.purge_expired()
+        self.assertIsNone(
+            self.repository.get_first_by_filter(TokenBlocklist, TokenBlocklist.jti == jti))
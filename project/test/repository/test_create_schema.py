@@ -0,0 +1,110 @@
+import os
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+from sqlalchemy import create_engine, inspect, text
+from app import create_app
+from src.model.space import Space
+from src.model.share import Share
+from src.repository.sql_alchemy_repository import SqlAlchemyRepository
+from test.helper import register_and_login, read_resource
+
+
+class TestCreateSchema(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='test-schema-')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.url = 'sqlite:///' + os.path.join(self.directory, 'db.sqlite')
+
+    def create_old_tables(self):
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.execute(text(
+                'CREATE TABLE spaces (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL)'))
+            connection.execute(text(
+                'CREATE TABLE tokenblocklist (id INTEGER PRIMARY KEY, jti VARCHAR(36) NOT NULL)'))
+            connection.execute(text("INSERT INTO spaces (id, name) VALUES (1, 'space-1')"))
+        engine.dispose()
+
+    def test_missing_columns_added(self):
+        self.create_old_tables()
+        repository = SqlAlchemyRepository(self.url)
+        repository.create_schema()
+
+        inspector = inspect(repository.engine)
+        self.assertIn('status', {column['name'] for column in inspector.get_columns('spaces')})
+        self.assertIn('expires_at',
+                      {column['name'] for column in inspector.get_columns('tokenblocklist')})
+        self.assertIn('ix_tokenblocklist_expires_at',
+                      {index['name'] for index in inspector.get_indexes('tokenblocklist')})
+        self.assertEqual(repository.get_by_id(Space, 1).status, Space.STATUS_ACTIVE)
+        repository.remove_session()
+
+    def test_run_again(self):
+        repository = SqlAlchemyRepository(self.url)
+        repository.create_schema()
+        repository.create_schema()
+        self.assertIn('owner', {column['name'] for column in
+                                inspect(repository.engine).get_columns('space_deletion_jobs')})
+
+    def create_old_shares(self):
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.execute(text(
+                'CREATE TABLE users (id INTEGER PRIMARY KEY, login VARCHAR NOT NULL, '
+                'password VARCHAR NOT NULL)'))
+            connection.execute(text(
+                'CREATE TABLE spaces (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL)'))
+            connection.execute(text(
+                'CREATE TABLE assignments (id INTEGER PRIMARY KEY, space_id INTEGER NOT NULL, '
+                'user_id INTEGER NOT NULL, is_admin BOOLEAN)'))
+            connection.execute(text(
+                'CREATE TABLE shares (id INTEGER PRIMARY KEY, space_id INTEGER NOT NULL, '
+                'user_id INTEGER NOT NULL, text VARCHAR NOT NULL, timestamp DATETIME)'))
+            connection.execute(text("INSERT INTO spaces (id, name) VALUES (1, 'space-1')"))
+            connection.execute(text(
+                'INSERT INTO assignments (space_id, user_id, is_admin) VALUES (1, 1, 1)'))
+            connection.execute(text(
+                "INSERT INTO shares (id, space_id, user_id, text, timestamp) VALUES "
+                "(1, 1, 1, 'with image', '2023-01-01 10:00:00'), "
+                "(2, 1, 1, 'without image', '2023-01-01 11:00:00')"))
+        engine.dispose()
+
+    def test_shares_backfilled(self):
+        self.create_old_shares()
+        repository = SqlAlchemyRepository(self.url)
+        repository.create_schema()
+        self.assertEqual(repository.get_by_id(Share, 1).image_status, Share.IMAGE_PENDING)
+        repository.add(Share(1, 1, 'new share'))
+        self.assertEqual(repository.get_by_id(Share, 3).image_status, Share.IMAGE_NONE)
+        repository.remove_session()
+
+    def test_backfilled_images_kept(self):
+        self.create_old_shares()
+        image_root = os.path.join(self.directory, 'images')
+        os.makedirs(os.path.join(image_root, 'space-id-1'))
+        with open(os.path.join(image_root, 'space-id-1', '1.jpg'), 'wb') as image_file:
+            image_file.write(read_resource('test-image-1.jpg'))
+        app = create_app(config={
+            'DATABASE_URL': self.url,
+            'IMAGE_BACKEND': 'local',
+            'LOCAL_IMAGE_ROOT': image_root,
+            'UPLOAD_SPOOL_DIR': os.path.join(self.directory, 'upload-spool'),
+            'SECRET_KEY': 'test-schema',
+            'JWT_SECRET_KEY': 'test-schema'
+        })
+        client = app.test_client()
+        token, _ = register_and_login(client)
+
+        response = client.get('/shares/1', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual(data['image_status'], 'ready')
+        response = client.get(data['image_url'])
+        response.close()
+        self.assertEqual(response.status_code, 200)
+        response = client.get('/shares/2', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual(data['image_status'], 'none')
+        self.assertIsNone(data['image_url'])
@@ -1,4 +1,5 @@
 import json
+from io import BytesIO
 from unittest import TestCase
 from test.helper import (
     get_app, create_space_as_admin, register_and_login,
@@ -33,9 +34,11 @@ class TestCreateShare(TestCase):
                 "id": admin.get('id'),
                 "login": admin.get('login')
             },
-            "text": "Lorem ipsum"
+            "text": "Lorem ipsum",
             # "timestamp":
             # "image_url":
+            "image_status": "none",
+            "image_variants": None
         }
         data = json.loads(response.data)
         data.pop("timestamp", None)
@@ -138,3 +141,16 @@ class TestCreateShare(TestCase):
             f'/spaces/{space_id}/shares', data=data, headers={"Authorization": f"Bearer {token}"})
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data, b"Text max 200 characters")
+
+    def test_file_not_an_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        data = {
+            "text": "Lorem ipsum",
+            "file": (BytesIO(b"not an image"), 'img')
+        }
+        response = self.client.post(
+            f'/spaces/{space_id}/shares', data=data,
+            content_type='multipart/form-data',
+            headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, b"File must be an image")
@@ -46,7 +46,9 @@ class TestEditShare(TestCase):
                 "login": admin.get('login')
             },
             "text": "Edit lorem ipsum",
-            "image_url": None
+            "image_url": None,
+            "image_status": "none",
+            "image_variants": None
         }
         data = json.loads(response.data)
         data.pop("timestamp", None)
@@ -122,9 +124,13 @@ class TestEditShare(TestCase):
             },
             "text": "Edit lorem ipsum",
             # "image_url":
+            # "image_variants":
+            "image_status": "ready"
         }
         data.pop("timestamp", None)
         data.pop("image_url", None)
+        self.assertEqual(set(data.pop("image_variants")),
+                         {"original", "thumbnail", "medium"})
         self.assertEqual(data, expected_data)
         self.assertEqual(response.status_code, 200)
 
@@ -0,0 +1,41 @@
+import json
+from unittest import TestCase
+from test.helper import (
+    get_app, create_space_as_admin, create_share,
+    register_and_login, add_member
+)
+
+
+class TestGetImageStatus(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.client = cls.app.test_client()
+
+    def test_normal_run(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.get(
+            f'/shares/{share_id}/image-status', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(json.loads(response.data), {"image_status": "none", "image_size": None})
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_exist(self):
+        token, _ = register_and_login(self.client)
+        response = self.client.get(
+            '/shares/999999999/image-status', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data, b'No such share')
+
+    def test_not_owned(self):
+        admin_token, space_id, _ = create_space_as_admin(
+            self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, admin_token)
+        member_token, member = register_and_login(self.client)
+        add_member(self.client, space_id, member.get('login'), admin_token)
+        response = self.client.get(
+            f'/shares/{share_id}/image-status',
+            headers={"Authorization": f"Bearer {member_token}"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, b'User doesn\'t own this share')
@@ -39,7 +39,9 @@ class TestGetShare(TestCase):
             },
             "text": "Lorem ipsum",
             # "timestamp":
-            "image_url": None
+            "image_url": None,
+            "image_status": "none",
+            "image_variants": None
         }
         data = json.loads(response.data)
         data.pop("timestamp", None)
@@ -88,9 +90,11 @@ class TestGetShare(TestCase):
                 "id": user.get('id'),
                 "login": user.get('login')
             },
-            "text": "Lorem ipsum"
+            "text": "Lorem ipsum",
             # "timestamp":
             # "image_url":
+            # "image_variants":
+            "image_status": "ready"
         }
         data = json.loads(response.data)
 
@@ -99,6 +103,8 @@ class TestGetShare(TestCase):
 
         data.pop("timestamp", None)
         data.pop("image_url", None)
+        self.assertEqual(set(data.pop("image_variants")),
+                         {"original", "thumbnail", "medium"})
         self.assertEqual(data, expected_data)
         self.assertEqual(response.status_code, 200)
 
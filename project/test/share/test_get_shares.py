@@ -3,7 +3,7 @@ import time
 from unittest import TestCase
 from test.helper import (
     get_app, create_share, register_and_login, add_member, create_space_as_not_member,
-    create_space_as_admin, create_share_with_image, are_images_same
+    create_space_as_admin, create_share_with_image, are_images_same, count_queries
 )
 
 
@@ -41,7 +41,9 @@ class TestGetShares(TestCase):
                 },
                 "text": "Lorem ipsum",
                 # "timestamp":
-                "image_url": None
+                "image_url": None,
+                "image_status": "none",
+                "image_variants": None
             },
             {
                 "id": share_id_2,
@@ -51,7 +53,9 @@ class TestGetShares(TestCase):
                 },
                 "text": "Lorem ipsum",
                 # "timestamp":
-                "image_url": None
+                "image_url": None,
+                "image_status": "none",
+                "image_variants": None
             }
         ]
         data = json.loads(response.data)
@@ -60,6 +64,59 @@ class TestGetShares(TestCase):
         self.assertEqual(data, expected_data)
         self.assertEqual(response.status_code, 200)
 
+    def test_query_count_independent_of_size(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        create_share(self.client, space_id, token)
+        headers = {"Authorization": f"Bearer {token}"}
+        _, small_count = count_queries(self.app, lambda: self.client.get(
+            f'/spaces/{space_id}/shares', headers=headers))
+        for _ in range(3):
+            member_token, member = register_and_login(self.client)
+            add_member(self.client, space_id, member.get('login'), token)
+            create_share(self.client, space_id, member_token)
+        response, large_count = count_queries(self.app, lambda: self.client.get(
+            f'/spaces/{space_id}/shares', headers=headers))
+        self.assertEqual(len(json.loads(response.data)), 4)
+        self.assertEqual(small_count, large_count)
+
+    def test_pagination(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id_1 = create_share(self.client, space_id, token)
+        _, share_id_2 = create_share(self.client, space_id, token)
+        _, share_id_3 = create_share(self.client, space_id, token)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = self.client.get(
+            f'/spaces/{space_id}/shares?limit=2', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([share['id'] for share in json.loads(response.data)],
+                         [share_id_3, share_id_2])
+
+        response = self.client.get(
+            f'/spaces/{space_id}/shares?limit=2&before={share_id_2}', headers=headers)
+        self.assertEqual([share['id'] for share in json.loads(response.data)],
+                         [share_id_1])
+
+        response = self.client.get(
+            f'/spaces/{space_id}/shares?limit=1&after={share_id_1}', headers=headers)
+        self.assertEqual([share['id'] for share in json.loads(response.data)],
+                         [share_id_2])
+
+    def test_pagination_invalid_limit(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        response = self.client.get(
+            f'/spaces/{space_id}/shares?limit=0', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, b"Limit must be between 1 and 100")
+
+    def test_pagination_invalid_cursor(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        response = self.client.get(
+            f'/spaces/{space_id}/shares?before=999999999',
+            headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, b"Invalid cursor '999999999'")
+
     def test_space_not_exist(self):
         token, _ = register_and_login(self.client)
         response = self.client.get(
@@ -97,7 +154,9 @@ class TestGetShares(TestCase):
                 },
                 "text": "Lorem ipsum",
                 # "timestamp":
-                "image_url": None
+                "image_url": None,
+                "image_status": "none",
+                "image_variants": None
             },
             {
                 "id": share_id_2,
@@ -108,6 +167,8 @@ class TestGetShares(TestCase):
                 "text": "Lorem ipsum",
                 # "timestamp":
                 # "image_url":
+                # "image_variants":
+                "image_status": "ready"
             },
             {
                 "id": share_id_1,
@@ -118,6 +179,8 @@ class TestGetShares(TestCase):
                 "text": "Lorem ipsum",
                 # "timestamp":
                 # "image_url":
+                # "image_variants":
+                "image_status": "ready"
             }
         ]
         data = json.loads(response.data)
@@ -130,6 +193,9 @@ class TestGetShares(TestCase):
 
         data[1].pop("image_url", None)
         data[2].pop("image_url", None)
+        for item in data[1:]:
+            self.assertEqual(set(item.pop("image_variants")),
+                             {"original", "thumbnail", "medium"})
         for item in data:
             item.pop("timestamp", None)
         self.assertEqual(data, expected_data)
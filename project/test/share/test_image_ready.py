@@ -0,0 +1,71 @@
+import json
+import time
+from io import BytesIO
+from unittest import TestCase
+from test.helper import get_app, create_space_as_admin, create_share, read_resource
+
+
+class TestImageReady(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.app.config['DISTRIBUTOR_TOKEN'] = 'distributor-token'
+        cls.client = cls.app.test_client()
+
+    def test_wrong_token(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-ready', headers={"X-Distributor-Token": "wrong"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data, b"You aren't authorized")
+
+    def test_no_token(self):
+        response = self.client.post('/shares/1/image-ready')
+        self.assertEqual(response.status_code, 401)
+
+    def test_normal_run(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-ready',
+            headers={"X-Distributor-Token": "distributor-token"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"Image marked as ready")
+
+        response = self.client.get(
+            f'/shares/{share_id}', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(json.loads(response.data).get('image_status'), 'ready')
+
+    def test_ready_before_upload_finished(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        self.client.put(
+            f'/shares/{share_id}',
+            data={'text': 'Lorem ipsum',
+                  'file': (BytesIO(read_resource('test-image-1.jpg')), 'img')},
+            content_type='multipart/form-data',
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        self.client.post(
+            f'/shares/{share_id}/image-ready',
+            headers={"X-Distributor-Token": "distributor-token"})
+        data = {}
+        for _ in range(70):
+            response = self.client.get(
+                f'/shares/{share_id}/image-status',
+                headers={"Authorization": f"Bearer {token}"})
+            data = json.loads(response.data)
+            if data.get('image_size'):
+                break
+            time.sleep(0.1)
+        self.assertEqual(data.get('image_status'), 'ready')
+        self.assertIsNotNone(data.get('image_size'))
+
+    def test_share_not_exist(self):
+        response = self.client.post(
+            '/shares/999999999/image-ready',
+            headers={"X-Distributor-Token": "distributor-token"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data, b"No such share")
@@ -0,0 +1,89 @@
+import json
+from unittest import TestCase
+import requests
+from test.helper import (
+    get_app, create_space_as_admin, create_share, register_and_login,
+    read_resource, wait_for_image, are_images_same
+)
+
+
+class TestImageUpload(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.client = cls.app.test_client()
+
+    def test_not_exist(self):
+        token, _ = register_and_login(self.client)
+        for url in ('/shares/999999999/image-upload', '/shares/999999999/image-upload/confirm'):
+            response = self.client.post(
+                url, headers={"Authorization": f"Bearer {token}"})
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.data, b'No such share')
+
+    def test_not_owned(self):
+        admin_token, space_id, _ = create_space_as_admin(
+            self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, admin_token)
+        not_owner_token, _ = register_and_login(self.client)
+        for url in (f'/shares/{share_id}/image-upload', f'/shares/{share_id}/image-upload/confirm'):
+            response = self.client.post(
+                url, headers={"Authorization": f"Bearer {not_owner_token}"})
+            self.assertEqual(response.status_code, 403)
+            self.assertEqual(response.data, b'User doesn\'t own this share')
+
+    def test_normal_run_with_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertIn('url', data)
+        self.assertEqual(data['fields']['key'], f'{space_id}-{share_id}.jpg')
+
+    def test_confirm_uploaded_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload', headers={"Authorization": f"Bearer {token}"})
+        upload = json.loads(response.data)
+        requests.post(upload['url'], data=upload['fields'],
+                      files={'file': read_resource('test-image-2.jpg')}, timeout=10)
+
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload/confirm',
+            headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 200)
+        wait_for_image(self.client, share_id, token)
+        response = self.client.get(
+            f'/shares/{share_id}', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual(data['image_status'], 'ready')
+        self.assertEqual(set(data['image_variants']), {'original', 'thumbnail', 'medium'})
+        self.assertTrue(are_images_same(data, 'test-image-2.jpg'))
+
+    def test_confirm_not_an_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload', headers={"Authorization": f"Bearer {token}"})
+        upload = json.loads(response.data)
+        requests.post(upload['url'], data=upload['fields'],
+                      files={'file': b'not an image'}, timeout=10)
+
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload/confirm',
+            headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, b'File must be an image')
+
+    def test_confirm_not_uploaded_image(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        _, share_id = create_share(self.client, space_id, token)
+        response = self.client.post(
+            f'/shares/{share_id}/image-upload/confirm',
+            headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, b"Image hasn't been uploaded")
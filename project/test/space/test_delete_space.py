@@ -1,9 +1,13 @@
+import json
 from unittest import TestCase
 from test.helper import (
     register_and_login, get_app, create_space_as_admin,
     create_space_as_member, add_member, create_share,
-    register, create_share_with_image, find_bucket
+    register, create_share_with_image, find_bucket, delete_space
 )
+from src.model.space import Space
+from src.model.space_deletion_job import SpaceDeletionJob
+from src.repository.sql_alchemy_repository import SqlAlchemyRepository
 
 
 class TestDeleteSpace(TestCase):
@@ -21,8 +25,10 @@ class TestDeleteSpace(TestCase):
         token, space_id, _ = create_space_as_admin(self.client, 'space-1')
         response = self.client.delete(
             f'/spaces/{space_id}', headers={"Authorization": f"Bearer {token}"})
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, b"Space deleted")
+        self.assertEqual(response.status_code, 202)
+        job = json.loads(response.data)
+        self.assertEqual(job.get('space_id'), space_id)
+        self.assertIn(job.get('status'), ('pending', 'running', 'done'))
 
         response = self.client.get(
             f'/spaces/{space_id}', headers={"Authorization": f"Bearer {token}"})
@@ -58,8 +64,9 @@ class TestDeleteSpace(TestCase):
         token, space_id, _ = create_space_as_admin(self.client, 'space-1')
         create_share_with_image(
             self.client, space_id, 'test-image-1.jpg', token)
-        self.client.delete(
-            f'/spaces/{space_id}', headers={"Authorization": f"Bearer {token}"})
+        _, job = delete_space(self.client, space_id, token)
+        self.assertEqual(job.get('status'), 'done')
+        self.assertEqual(job.get('deleted_shares'), 1)
         self.assertFalse(find_bucket(f'test-space-id-{space_id}'))
 
     def test_delete_share_with_space(self):
@@ -72,10 +79,10 @@ class TestDeleteSpace(TestCase):
         self.client.delete(
             f"/spaces/{space_id}/members/{member.get('id')}", headers={"Authorization": f"Bearer {admin_token}"})
 
-        response = self.client.delete(
-            f'/spaces/{space_id}', headers={"Authorization": f"Bearer {admin_token}"})
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, b"Space deleted")
+        response, job = delete_space(self.client, space_id, admin_token)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(job.get('status'), 'done')
+        self.assertEqual(job.get('deleted_shares'), 2)
 
         response = self.client.get(
             f'/shares/{share_id_1}', headers={"Authorization": f"Bearer {admin_token}"})
@@ -86,3 +93,50 @@ class TestDeleteSpace(TestCase):
             f'/shares/{share_id_2}', headers={"Authorization": f"Bearer {member_token}"})
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.data, b'No such share')
+
+    def test_deletion_job_not_exist(self):
+        token, _ = register_and_login(self.client)
+        response = self.client.get(
+            '/space-deletions/999999999', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data, b'No such job')
+
+    def test_deletion_job_not_owned(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        response = self.client.delete(
+            f'/spaces/{space_id}', headers={"Authorization": f"Bearer {token}"})
+        other_token, _ = register_and_login(self.client)
+        response = self.client.get(
+            f"/space-deletions/{json.loads(response.data).get('id')}",
+            headers={"Authorization": f"Bearer {other_token}"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, b"Can't access this job")
+
+    def test_deleted_space_not_listed(self):
+        token, space_id, _ = create_space_as_admin(self.client, 'space-1')
+        self.client.delete(
+            f'/spaces/{space_id}', headers={"Authorization": f"Bearer {token}"})
+        response = self.client.get(
+            '/spaces', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(json.loads(response.data), [])
+
+    def test_delete_again_after_failure(self):
+        token, space_id, admin = create_space_as_admin(self.client, 'space-1')
+        repository = SqlAlchemyRepository(self.app.config['DATABASE_URL'])
+        space = repository.get_by_id(Space, space_id)
+        space.status = Space.STATUS_DELETING
+        repository.add(space)
+        job = SpaceDeletionJob(space_id, admin.get('id'))
+        job.status = SpaceDeletionJob.STATUS_FAILED
+        job.attempts = 3
+        repository.add(job)
+        failed_job_id = job.id
+        repository.remove_session()
+
+        response, job = delete_space(self.client, space_id, token)
+        self.assertEqual(response.status_code, 202)
+        self.assertNotEqual(job.get('id'), failed_job_id)
+        self.assertEqual(job.get('status'), 'done')
+        response = self.client.delete(
+            f'/spaces/{space_id}', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 404)
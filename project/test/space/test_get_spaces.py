@@ -48,6 +48,25 @@ class TestGetSpaces(TestCase):
         self.assertEqual(data, expected_data)
         self.assertEqual(response.status_code, 200)
 
+    def test_limit_and_offset(self):
+        token, _ = register_and_login(self.client)
+        create_space(self.client, "B-space", token)
+        create_space(self.client, "a-space", token)
+        create_space(self.client, "c-space", token)
+        response = self.client.get(
+            '/spaces?limit=2&offset=1', headers={"Authorization": f"Bearer {token}"})
+        data = json.loads(response.data)
+        self.assertEqual([item['space']['name'] for item in data],
+                         ["B-space", "c-space"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_negative_offset(self):
+        token, _ = register_and_login(self.client)
+        response = self.client.get(
+            '/spaces?offset=-1', headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, b"Offset cannot be negative")
+
     def test_not_member(self):
         token, _ = create_space_as_not_member(self.client)
         response, space_id_2 = create_space(self.client, 'space-2', token)
@@ -0,0 +1,126 @@
+import time
+import threading
+from datetime import datetime, timedelta
+from unittest import TestCase, mock
+from test.helper import get_app, register_and_login
+from src.model.space import Space
+from src.model.space_deletion_job import SpaceDeletionJob
+from src.repository.sql_alchemy_repository import SqlAlchemyRepository
+from src.service.helper.space_deletion_worker import SpaceDeletionWorker
+
+MAX_ATTEMPTS = 3
+LEASE_TIMEOUT = 60
+
+
+class TestResumeSpaceDeletion(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.repository = SqlAlchemyRepository(cls.app.config['DATABASE_URL'])
+        _, cls.user = register_and_login(cls.app.test_client())
+
+    def add_job(self, status, owner=None, attempts=0, space_id=999999999, updated_at=None):
+        # The space doesn't exist, so running the job only marks it as done.
+        job = SpaceDeletionJob(space_id, self.user.get('id'))
+        job.status = status
+        job.owner = owner
+        job.attempts = attempts
+        job.updated_at = updated_at or datetime.utcnow()
+        self.repository.add(job)
+        job_id = job.id
+        self.repository.remove_session()
+        return job_id
+
+    def create_worker(self, image_service=None, lease_timeout=LEASE_TIMEOUT):
+        return SpaceDeletionWorker(
+            self.repository, image_service or mock.Mock(), 10, 2, MAX_ATTEMPTS, lease_timeout)
+
+    def resume(self, workers=1):
+        for _ in range(workers):
+            worker = self.create_worker()
+            worker.resume()
+            worker.executor.shutdown(wait=True)
+
+    def get_job(self, job_id):
+        job = self.repository.get_by_id(SpaceDeletionJob, job_id)
+        self.repository.remove_session()
+        return job
+
+    def test_pending_job_run_once(self):
+        job_id = self.add_job(SpaceDeletionJob.STATUS_PENDING)
+        self.resume(workers=3)
+        job = self.get_job(job_id)
+        self.assertEqual(job.status, SpaceDeletionJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+
+    def test_running_job_with_lease(self):
+        job_id = self.add_job(SpaceDeletionJob.STATUS_RUNNING, 'other-host:1', 1)
+        self.resume()
+        job = self.get_job(job_id)
+        self.assertEqual(job.status, SpaceDeletionJob.STATUS_RUNNING)
+        self.assertEqual(job.attempts, 1)
+
+    def test_running_job_with_expired_lease(self):
+        updated_at = datetime.utcnow() - timedelta(seconds=LEASE_TIMEOUT + 1)
+        job_id = self.add_job(SpaceDeletionJob.STATUS_RUNNING, 'other-host:1', 1,
+                              updated_at=updated_at)
+        self.resume()
+        job = self.get_job(job_id)
+        self.assertEqual(job.status, SpaceDeletionJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 2)
+
+    def test_heartbeat(self):
+        space = Space('space-1')
+        self.repository.add(space)
+        space_id = space.id
+        self.repository.remove_session()
+        released = threading.Event()
+        image_service = mock.Mock()
+        image_service.delete_space_directory.side_effect = lambda *_: released.wait(5)
+        worker = self.create_worker(image_service, lease_timeout=0.3)
+        job_id = worker.start(space_id, self.user.get('id')).id
+        self.repository.remove_session()
+
+        heartbeats = set()
+        for _ in range(50):
+            job = self.get_job(job_id)
+            if job.status == SpaceDeletionJob.STATUS_RUNNING:
+                heartbeats.add(job.updated_at)
+            if len(heartbeats) > 2:
+                break
+            time.sleep(0.05)
+        released.set()
+        worker.executor.shutdown(wait=True)
+        self.assertGreater(len(heartbeats), 2)
+        self.assertEqual(self.get_job(job_id).status, SpaceDeletionJob.STATUS_DONE)
+
+    def test_failed_job_retried(self):
+        job_id = self.add_job(SpaceDeletionJob.STATUS_FAILED, attempts=1)
+        self.resume()
+        self.assertEqual(self.get_job(job_id).status, SpaceDeletionJob.STATUS_DONE)
+
+    def test_failed_job_out_of_attempts(self):
+        job_id = self.add_job(SpaceDeletionJob.STATUS_FAILED, attempts=MAX_ATTEMPTS)
+        self.resume()
+        job = self.get_job(job_id)
+        self.assertEqual(job.status, SpaceDeletionJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, MAX_ATTEMPTS)
+
+    def test_failed_job_requested_again(self):
+        job_id = self.add_job(
+            SpaceDeletionJob.STATUS_FAILED, attempts=MAX_ATTEMPTS, space_id=999999998)
+        worker = self.create_worker()
+        new_job_id = worker.retry(999999998, self.user.get('id')).id
+        self.repository.remove_session()
+        worker.executor.shutdown(wait=True)
+        self.assertNotEqual(new_job_id, job_id)
+        self.assertEqual(self.get_job(new_job_id).status, SpaceDeletionJob.STATUS_DONE)
+        self.assertEqual(self.get_job(job_id).status, SpaceDeletionJob.STATUS_FAILED)
+
+    def test_unfinished_job_requested_again(self):
+        job_id = self.add_job(SpaceDeletionJob.STATUS_PENDING, space_id=999999997)
+        worker = self.create_worker()
+        self.assertEqual(worker.retry(999999997, self.user.get('id')).id, job_id)
+        self.repository.remove_session()
+        worker.executor.shutdown(wait=True)